@@ -53,7 +53,10 @@ def debug_chunk():
     print("\n🎨 Creating drawtext filters...")
     try:
         drawtext_filters = create_ffmpeg_drawtext_filters(subtitles, video_width, video_height)
-        print(f"🔧 Generated filters: {len(drawtext_filters.split(';')) if ';' in drawtext_filters else 1} parts")
+        if drawtext_filters is None:
+            print("⚠️  No subtitles to draw - the chunk would be stream-copied")
+            return
+        print(f"🔧 Generated filters: {drawtext_filters.count('drawtext=') + drawtext_filters.count('drawbox=')} parts")
         print(f"📏 Filter length: {len(drawtext_filters)} characters")
         
         # Show first part of filter
@@ -21,10 +21,13 @@ import time
 
 def find_png_files(directory: Path) -> List[Path]:
     """Find all PNG files in the directory, sorted numerically."""
-    png_files = []
-    
-    for file_path in directory.glob("*.png"):
-        png_files.append(file_path)
+    # scandir evita o lstat por entrada do glob (is_file vem do d_type)
+    with os.scandir(directory) as it:
+        png_files = [
+            Path(entry.path) for entry in it
+            if entry.name.endswith('.png') and not entry.name.startswith('.')
+            and entry.is_file(follow_symlinks=False)
+        ]
     
     # Sort numerically by filename (extract number from filename)
     def sort_key(path):
@@ -50,9 +53,18 @@ def add_letterbox(image_path: Path, shift_up: int, bar_height: int, output_path:
     """
     try:
         with Image.open(image_path) as img:
-            # Converte para RGB se necessário
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
+            # Mantém L/P quando o preto é representável (índice 0), evitando a
+            # promoção para RGB; demais modos continuam sendo convertidos
+            mode = img.mode
+            if mode == 'P':
+                palette = img.getpalette()
+                if not palette or palette[:3] != [0, 0, 0] or 'transparency' in img.info:
+                    mode = 'RGB'
+            elif mode != 'L':
+                mode = 'RGB'
+            if img.mode != mode:
+                img = img.convert(mode)
+            black = 0 if mode in ('L', 'P') else (0, 0, 0)
             
             original_width, original_height = img.size
             
@@ -63,7 +75,9 @@ def add_letterbox(image_path: Path, shift_up: int, bar_height: int, output_path:
                 return True
             
             # Cria nova imagem com fundo preto
-            new_img = Image.new('RGB', (original_width, original_height), (0, 0, 0))
+            new_img = Image.new(mode, (original_width, original_height), black)
+            if mode == 'P':
+                new_img.putpalette(img.getpalette())
             
             # Cola a imagem original deslocada para cima
             # A imagem será cortada na parte superior se necessário
@@ -80,11 +94,11 @@ def add_letterbox(image_path: Path, shift_up: int, bar_height: int, output_path:
             
             # Faixa preta superior
             if top_bar_height > 0:
-                draw.rectangle([0, 0, original_width, top_bar_height], fill=(0, 0, 0))
+                draw.rectangle([0, 0, original_width, top_bar_height], fill=black)
             
             # Faixa preta inferior
             if bottom_bar_height > 0:
-                draw.rectangle([0, original_height - bottom_bar_height, original_width, original_height], fill=(0, 0, 0))
+                draw.rectangle([0, original_height - bottom_bar_height, original_width, original_height], fill=black)
             
             # Salva a imagem processada
             save_path = output_path if output_path else image_path
@@ -15,36 +15,83 @@ Example: python3 merge_chunks.py mulher13
 
 import sys
 import argparse
+import asyncio
 import subprocess
 import os
+import errno
 import shutil
+import tempfile
 import re
+from collections import deque
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Tuple, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Dict, Optional
 import glob
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
-def find_original_chunks(directory: Path) -> Dict[int, Path]:
+# ioctl FICLONE (linux/fs.h) - reflink em btrfs/xfs
+FICLONE = getattr(fcntl, 'FICLONE', 0x40049409)
+
+# Erros que indicam "não suportado aqui" e devem cair para o próximo método
+_CLONE_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOTSUP, errno.EOPNOTSUPP, errno.EINVAL, errno.ENOSYS, errno.ENOTTY}
+
+# Buffer da cópia comum quando não há clone/copy_file_range
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Linhas finais do stderr do FFmpeg mantidas para mensagens de erro
+STDERR_TAIL_LINES = 50
+
+# "time=HH:MM:SS.ms" nas estatísticas / "out_time=..." no -progress do FFmpeg
+_FFMPEG_TIME_RE = re.compile(r'time=(\d+):(\d+):([\d.]+)')
+
+# Merge hierárquico: quantos arquivos por chamada do FFmpeg e quantas em paralelo
+TIER_SIZE = 16
+TIER_WORKERS = 4
+
+# Cache da verificação de ferramentas externas (ffmpeg, mkvmerge)
+TOOL_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'subrim'
+
+# *_chunk_XXX.mp4 (original) ou *_chunk_XXX_processed.mp4 (processado)
+_CHUNK_RE = re.compile(r'_chunk_(\d+)(_processed)?\.mp4$')
+
+
+def scan_chunks(directory: Path) -> Tuple[Dict[int, Path], Dict[int, Path]]:
     """
-    Encontra todos os chunks originais no diretório e retorna um dicionário
-    mapeando número do chunk -> caminho do arquivo.
+    Varre o diretório uma única vez e separa os chunks em originais e
+    processados. Retorna (originais, processados), ambos mapeando
+    número do chunk -> caminho do arquivo.
     """
     chunk_dict = {}
+    processed_dict = {}
     
-    # Procurar por arquivos que seguem o padrão *_chunk_XXX.mp4 (não _processed)
-    pattern = "*_chunk_*.mp4"
-    for file_path in directory.glob(pattern):
-        # Excluir arquivos _processed.mp4
-        if "_processed.mp4" in file_path.name:
-            continue
-            
-        # Extrair número do chunk
-        match = re.search(r'_chunk_(\d+)\.mp4$', file_path.name)
-        if match:
+    with os.scandir(directory) as it:
+        for entry in it:
+            name = entry.name
+            if name.startswith('.'):
+                continue
+            match = _CHUNK_RE.search(name)
+            if not match:
+                continue
             chunk_number = int(match.group(1))
-            chunk_dict[chunk_number] = file_path
+            if match.group(2):
+                processed_dict[chunk_number] = directory / name
+            else:
+                chunk_dict[chunk_number] = directory / name
     
-    return chunk_dict
+    return chunk_dict, processed_dict
+
+
+def find_original_chunks(directory: Path) -> Dict[int, Path]:
+    """
+    Encontra todos os chunks originais no diretório e retorna um dicionário
+    mapeando número do chunk -> caminho do arquivo.
+    """
+    return scan_chunks(directory)[0]
 
 
 def find_processed_chunks(directory: Path) -> Dict[int, Path]:
@@ -52,36 +99,75 @@ def find_processed_chunks(directory: Path) -> Dict[int, Path]:
     Encontra todos os chunks processados no diretório e retorna um dicionário
     mapeando número do chunk -> caminho do arquivo.
     """
-    processed_dict = {}
-    
-    # Procurar por arquivos que terminam com _processed.mp4
-    pattern = "*_processed.mp4"
-    for file_path in directory.glob(pattern):
-        # Extrair número do chunk
-        match = re.search(r'_chunk_(\d+)_processed\.mp4$', file_path.name)
-        if match:
-            chunk_number = int(match.group(1))
-            processed_dict[chunk_number] = file_path
-    
-    return processed_dict
+    return scan_chunks(directory)[1]
 
 
-def validate_and_create_missing_processed(directory: Path) -> Tuple[Dict[int, Path], List[Path]]:
+def _fast_clone(src: Path, dst: Path) -> None:
+    """
+    Copia src para dst tentando primeiro métodos sem cópia de dados
+    (copy_file_range / reflink FICLONE) e caindo para cópia comum.
+    Preserva os timestamps como o shutil.copy2.
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(src_fd).st_size
+        done = False
+
+        # 1. copy_file_range (Linux 4.5+): reflink em FS CoW, server-side copy em NFS
+        if hasattr(os, 'copy_file_range'):
+            try:
+                copied = 0
+                while copied < size:
+                    n = os.copy_file_range(src_fd, dst_fd, size - copied)
+                    if n == 0:
+                        break
+                    copied += n
+                done = copied == size
+            except OSError as e:
+                if e.errno not in _CLONE_FALLBACK_ERRNOS:
+                    raise
+
+        # 2. ioctl FICLONE (btrfs/xfs)
+        if not done and fcntl is not None and sys.platform.startswith('linux'):
+            try:
+                fcntl.ioctl(dst_fd, FICLONE, src_fd)
+                done = True
+            except OSError as e:
+                if e.errno not in _CLONE_FALLBACK_ERRNOS:
+                    raise
+
+        # 3. Cópia comum com buffer de 1 MiB (o padrão do shutil é 64 KiB)
+        if not done:
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            shutil.copyfileobj(fsrc, fdst, length=COPY_BUFFER_SIZE)
+            if hasattr(os, 'posix_fadvise'):
+                # Não manter no page cache dados que não serão relidos
+                fdst.flush()
+                os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+                os.posix_fadvise(dst_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+    shutil.copystat(src, dst)
+
+
+def validate_and_create_missing_processed(directory: Path) -> Tuple[List[Path], List[Path]]:
     """
     Valida chunks e cria arquivos _processed.mp4 faltantes.
-    Retorna (dicionário_de_processados, lista_de_arquivos_criados).
+    Retorna (lista_de_processados_ordenada_por_chunk, lista_de_arquivos_criados).
     """
     print(f"🔍 Varrendo pasta: {directory.name}")
     
-    original_chunks = find_original_chunks(directory)
-    processed_chunks = find_processed_chunks(directory)
+    original_chunks, processed_chunks = scan_chunks(directory)
     
     print(f"📊 Chunks originais encontrados: {len(original_chunks)}")
     print(f"📊 Chunks processados existentes: {len(processed_chunks)}")
     
     if not original_chunks:
         print("❌ Nenhum chunk original encontrado!")
-        return processed_chunks, []
+        return _sorted_by_chunk(processed_chunks), []
     
     # Determinar sequência esperada
     min_chunk = min(original_chunks.keys())
@@ -91,6 +177,7 @@ def validate_and_create_missing_processed(directory: Path) -> Tuple[Dict[int, Pa
     
     created_files = []
     missing_count = 0
+    to_clone = []
     
     # Verificar cada chunk na sequência
     for chunk_num in range(min_chunk, max_chunk + 1):
@@ -103,20 +190,35 @@ def validate_and_create_missing_processed(directory: Path) -> Tuple[Dict[int, Pa
                 processed_name = original_file.name.replace('.mp4', '_processed.mp4')
                 processed_path = directory / processed_name
                 
-                try:
-                    print(f"📋 Criando: {chunk_num:03d} - {original_file.name} -> {processed_name}")
-                    shutil.copy2(original_file, processed_path)
-                    
-                    # Adicionar ao dicionário de processados e à lista de criados
-                    processed_chunks[chunk_num] = processed_path
-                    created_files.append(processed_path)
-                    
-                except Exception as e:
-                    print(f"❌ Erro ao copiar chunk {chunk_num:03d}: {e}")
+                print(f"📋 Criando: {chunk_num:03d} - {original_file.name} -> {processed_name}")
+                to_clone.append((chunk_num, original_file, processed_path))
             else:
                 print(f"⚠️  Chunk {chunk_num:03d} não encontrado (nem original nem processado)")
                 missing_count += 1
     
+    # Clonar em paralelo (cada tarefa escreve num destino distinto)
+    if to_clone:
+        def clone(item):
+            chunk_num, original_file, processed_path = item
+            try:
+                _fast_clone(original_file, processed_path)
+                return None
+            except Exception as e:
+                return e
+        
+        max_workers = min(8, os.cpu_count() or 1, len(to_clone))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            errors = list(executor.map(clone, to_clone))
+        
+        # Atualizar resultados apenas na thread principal
+        for (chunk_num, _, processed_path), error in zip(to_clone, errors):
+            if error is None:
+                # Adicionar ao dicionário de processados e à lista de criados
+                processed_chunks[chunk_num] = processed_path
+                created_files.append(processed_path)
+            else:
+                print(f"❌ Erro ao copiar chunk {chunk_num:03d}: {error}")
+    
     # Resumo da validação
     if created_files:
         print(f"✅ Criados {len(created_files)} arquivos _processed.mp4")
@@ -126,55 +228,354 @@ def validate_and_create_missing_processed(directory: Path) -> Tuple[Dict[int, Pa
     if missing_count > 0:
         print(f"⚠️  {missing_count} chunks estão faltando completamente")
     
-    return processed_chunks, created_files
+    return _sorted_by_chunk(processed_chunks), created_files
+
 
+def _sorted_by_chunk(chunks: Dict[int, Path]) -> List[Path]:
+    """Ordena pelo número inteiro do chunk (extraído por _CHUNK_RE), não pelo nome."""
+    return [path for _, path in sorted(chunks.items(), key=itemgetter(0))]
 
-def display_processed_files_list(processed_chunks: Dict[int, Path]) -> List[Path]:
+
+def is_up_to_date(output_file: Path, processed_files: List[Path]) -> bool:
     """
-    Exibe lista completa de arquivos processados em ordem.
-    Retorna lista ordenada de arquivos para o merge.
+    Verifica (estilo Make) se o arquivo final existe e é mais novo que
+    todos os chunks processados.
     """
-    if not processed_chunks:
+    directory = output_file.parent
+    wanted = {p.name for p in processed_files if p.parent == directory}
+    output_mtime = None
+    newest = 0
+
+    # Uma passada de scandir; DirEntry.stat evita construir Paths por entrada
+    with os.scandir(directory) as it:
+        for entry in it:
+            name = entry.name
+            if name == output_file.name:
+                output_mtime = entry.stat(follow_symlinks=False).st_mtime_ns
+            elif name in wanted:
+                newest = max(newest, entry.stat(follow_symlinks=False).st_mtime_ns)
+
+    if output_mtime is None:
+        return False
+
+    # Chunks fora da pasta do arquivo final (caso raro)
+    for p in processed_files:
+        if p.parent != directory:
+            newest = max(newest, p.stat().st_mtime_ns)
+
+    return output_mtime >= newest
+
+
+def display_processed_files_list(file_list: List[Path]) -> None:
+    """
+    Exibe lista completa de arquivos processados (já ordenada por chunk).
+    """
+    if not file_list:
         print("\n❌ Nenhum arquivo processado disponível")
-        return []
+        return
     
     print(f"\n📋 LISTA COMPLETA DE ARQUIVOS PROCESSADOS:")
     print("=" * 70)
     
-    # Ordenar por número do chunk
-    sorted_chunks = sorted(processed_chunks.items())
-    file_list = []
-    
-    for i, (chunk_num, file_path) in enumerate(sorted_chunks, 1):
+    for i, file_path in enumerate(file_list, 1):
+        chunk_num = int(_CHUNK_RE.search(file_path.name).group(1))
         print(f"  {i:3d}. [{chunk_num:03d}] {file_path.name}")
-        file_list.append(file_path)
     
     print(f"\n📊 Total de arquivos processados prontos para merge: {len(file_list)}")
-    
-    return file_list
 
 
-def create_concat_list(chunk_files: List[Path], list_file: Path) -> bool:
+def build_concat_list(chunk_files: List[Path]) -> str:
+    """
+    Monta em memória a lista ffconcat para o demuxer concat do FFmpeg.
+    """
+    # Caminho absoluto para evitar problemas: resolve cada diretório uma só vez
+    # (normalmente todos os chunks estão na mesma pasta)
+    resolved_dirs = {}
+    lines = ["ffconcat version 1.0\n"]
+    for chunk_file in chunk_files:
+        parent = chunk_file.parent
+        base = resolved_dirs.get(parent)
+        if base is None:
+            base = resolved_dirs[parent] = parent.resolve()
+        # Aspas simples escapadas
+        path = str(base / chunk_file.name).replace("'", "'\\''")
+        lines.append(f"file '{path}'\n")
+    return "".join(lines)
+
+
+def _probe_stream_layout(video_path: Path) -> str:
     """
-    Cria arquivo de lista para concatenação FFmpeg.
+    Retorna uma assinatura textual do container e dos parâmetros dos streams
+    (codec, resolução, pix_fmt, áudio) de um arquivo, ou "" em caso de erro.
     """
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-of', 'csv=p=0',
+        '-show_entries', 'format=format_name:stream=codec_name,width,height,pix_fmt,sample_rate,channels',
+        str(video_path)
+    ]
     try:
-        with open(list_file, 'w', encoding='utf-8') as f:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    except FileNotFoundError:
+        return ""
+    if result.returncode != 0 or result.stderr.strip():
+        return ""
+    return result.stdout.strip()
+
+
+def _try_binary_concat(chunk_files: List[Path], output_file: Path) -> bool:
+    """
+    Caminho rápido: concatena os bytes dos chunks diretamente (sendfile),
+    sem passar pelo FFmpeg. Só é seguro para containers que admitem
+    concatenação binária (MPEG-TS); MP4 comum tem um moov por arquivo e
+    não pode ser simplesmente emendado. Verifica apenas o primeiro e o
+    último chunk e valida o resultado com ffprobe.
+    """
+    first_layout = _probe_stream_layout(chunk_files[0])
+    if not first_layout or 'mpegts' not in first_layout:
+        return False
+    if len(chunk_files) > 1 and _probe_stream_layout(chunk_files[-1]) != first_layout:
+        return False
+
+    print(f"\n⚡ Chunks compatíveis: concatenação binária direta")
+    try:
+        with open(output_file, 'wb') as fdst:
             for chunk_file in chunk_files:
-                # Escrever caminho absoluto para evitar problemas
-                f.write(f"file '{chunk_file.absolute()}'\n")
+                with open(chunk_file, 'rb') as fsrc:
+                    size = os.fstat(fsrc.fileno()).st_size
+                    offset = 0
+                    try:
+                        while offset < size:
+                            sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, min(size - offset, 1 << 31))
+                            if sent == 0:
+                                break
+                            offset += sent
+                    except (OSError, AttributeError):
+                        # sendfile para arquivo regular não existe em todas as plataformas
+                        fsrc.seek(offset)
+                        fdst.seek(0, os.SEEK_END)
+                        shutil.copyfileobj(fsrc, fdst)
+    except OSError as e:
+        print(f"⚠️  Concatenação binária falhou: {e}")
+        return False
 
-        print(f"📄 Lista de concatenação criada: {list_file.name}")
-        return True
+    if not _probe_stream_layout(output_file):
+        print("⚠️  Resultado da concatenação binária inválido, usando merge normal")
+        return False
 
-    except Exception as e:
-        print(f"❌ Erro ao criar lista de concatenação: {e}")
+    return True
+
+
+def _merge_with_mkvmerge(chunk_files: List[Path], output_file: Path) -> Tuple[bool, Optional[float]]:
+    """
+    Concatena os chunks com mkvmerge (sintaxe de append "a +b +c") e remuxa
+    o MKV resultante para MP4 em uma única passada de stream copy.
+    Retorna (sucesso, duração em segundos informada pelo FFmpeg).
+    """
+    mkv_file = output_file.with_suffix('.mkv')
+    files = [str(p) for p in chunk_files]
+    cmd = ['mkvmerge', '-q', '-o', str(mkv_file), files[0]] + [f'+{f}' for f in files[1:]]
+
+    print(f"\n🔄 Executando mkvmerge...")
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        # mkvmerge: 0 = ok, 1 = ok com avisos, 2 = erro
+        if result.returncode not in (0, 1):
+            print("⚠️  mkvmerge falhou, usando FFmpeg concat")
+            if result.stdout:
+                print(f"📄 Detalhes do erro: {result.stdout}")
+            return False, None
+
+        remux_cmd = [
+            'ffmpeg',
+            '-i', str(mkv_file),
+            '-c', 'copy',
+            '-write_tmcd', '0',
+            '-fflags', '+bitexact',
+            '-movflags', '+faststart',
+            '-y',
+            str(output_file)
+        ]
+        result = subprocess.run(remux_cmd, capture_output=True, text=True, check=False)
+        if result.returncode != 0:
+            print("⚠️  Remux MKV -> MP4 falhou, usando FFmpeg concat")
+            if result.stderr:
+                print(f"📄 Detalhes do erro: {result.stderr}")
+            return False, None
+
+        return True, _parse_ffmpeg_duration(result.stderr.splitlines())
+    finally:
+        try:
+            mkv_file.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _ffmpeg_concat_cmd(output_file: Path, faststart: bool = True) -> List[str]:
+    """
+    Monta o comando do demuxer concat do FFmpeg (stream copy), lendo a
+    lista de concatenação do stdin.
+    """
+    cmd = [
+        'ffmpeg',
+        '-hide_banner',
+        '-loglevel', 'error',     # Apenas erros + progresso legível por máquina
+        '-nostats',
+        '-progress', 'pipe:2',
+        '-f', 'concat',           # Usar modo concat
+        '-thread_queue_size', '1024',
+        '-fflags', '+genpts',     # Regerar PTS em vez de recalcular
+        '-safe', '0',             # Permitir caminhos absolutos
+        '-protocol_whitelist', 'pipe,file',
+        '-i', 'pipe:0',           # Lista lida do stdin
+        '-c', 'copy',             # Copiar streams sem re-encoding
+        '-avoid_negative_ts', 'make_zero',
+        '-write_tmcd', '0',       # Sem trilha de timecode
+        '-fflags', '+bitexact',   # Metadados determinísticos
+    ]
+    if faststart:
+        cmd += ['-movflags', '+faststart']  # moov no início (Chromecast) na mesma passada
+    cmd += [
+        '-y',                     # Sobrescrever se existir
+        str(output_file)
+    ]
+    return cmd
+
+
+def _parse_ffmpeg_duration(stderr_lines) -> Optional[float]:
+    """
+    Extrai a duração final da saída do FFmpeg (última linha com "time=",
+    seja das estatísticas ou do -progress), dispensando um ffprobe extra.
+    """
+    for line in reversed(list(stderr_lines)):
+        if 'time=' not in line:
+            continue
+        matches = _FFMPEG_TIME_RE.findall(line)
+        if matches:
+            hours, minutes, seconds = matches[-1]
+            return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    return None
+
+
+def _check_concat_result(output_file: Path, returncode: int, stderr_tail: deque) -> bool:
+    """Reporta falha de uma chamada do FFmpeg concat."""
+    if returncode != 0:
+        print(f"❌ Erro no FFmpeg concat ({output_file.name})")
+        if stderr_tail:
+            print(f"📄 Detalhes do erro: {''.join(stderr_tail)}")
         return False
+    return True
+
+
+def _run_ffmpeg_concat(chunk_files: List[Path], output_file: Path,
+                       faststart: bool = True) -> Tuple[bool, Optional[float]]:
+    """
+    Executa uma chamada do demuxer concat do FFmpeg (stream copy).
+    A lista de concatenação é enviada pelo stdin (sem arquivo temporário).
+    Retorna (sucesso, duração em segundos informada pelo FFmpeg).
+    """
+    cmd = _ffmpeg_concat_cmd(output_file, faststart)
+
+    # stdout descartado; do stderr guarda-se apenas o final para diagnóstico
+    process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.PIPE, text=True, bufsize=1)
+    process.stdin.write(build_concat_list(chunk_files))
+    process.stdin.close()
+    stderr_tail = deque(process.stderr, maxlen=STDERR_TAIL_LINES)
+    returncode = process.wait()
+
+    if not _check_concat_result(output_file, returncode, stderr_tail):
+        return False, None
+    return True, _parse_ffmpeg_duration(stderr_tail)
+
+
+async def _run_ffmpeg_concat_async(chunk_files: List[Path], output_file: Path,
+                                   semaphore: asyncio.Semaphore) -> bool:
+    """
+    Versão assíncrona de _run_ffmpeg_concat (sem faststart, para
+    intermediários). O semáforo limita quantos FFmpeg rodam ao mesmo tempo.
+    """
+    async with semaphore:
+        process = await asyncio.create_subprocess_exec(
+            *_ffmpeg_concat_cmd(output_file, faststart=False),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        process.stdin.write(build_concat_list(chunk_files).encode('utf-8'))
+        await process.stdin.drain()
+        process.stdin.close()
+
+        stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+        async for line in process.stderr:
+            stderr_tail.append(line.decode('utf-8', errors='replace'))
+        returncode = await process.wait()
+
+    return _check_concat_result(output_file, returncode, stderr_tail)
+
+
+async def _merge_tier(files: List[Path], tmpdir: Path, tier: int) -> List[Path]:
+    """
+    Mergeia um nível da árvore: agrupa files em blocos de TIER_SIZE e
+    concatena cada bloco num arquivo intermediário. Retorna as saídas do nível.
+    """
+    groups = [files[i:i + TIER_SIZE] for i in range(0, len(files), TIER_SIZE)]
+    outputs = [tmpdir / f"tier{tier}_{i:04d}.mp4" for i in range(len(groups))]
+
+    print(f"🪜 Nível {tier}: {len(files)} arquivos -> {len(groups)} intermediários")
 
+    # I/O de disco domina: poucos FFmpeg simultâneos sobrepõem a fase de
+    # parse de um grupo com a escrita de outro sem saturar o disco
+    semaphore = asyncio.Semaphore(TIER_WORKERS)
+    results = await asyncio.gather(*(
+        _run_ffmpeg_concat_async(group, output, semaphore)
+        for group, output in zip(groups, outputs)
+    ))
 
-def merge_processed_chunks(chunk_files: List[Path], output_file: Path) -> bool:
+    if not all(results):
+        raise RuntimeError(f"falha no merge do nível {tier}")
+
+    return outputs
+
+
+async def _merge_tiers(chunk_files: List[Path], tmpdir: Path) -> List[Path]:
+    """Reduz a lista por níveis até caber numa única chamada do FFmpeg."""
+    files = chunk_files
+    tier = 0
+    while len(files) > TIER_SIZE:
+        files = await _merge_tier(files, tmpdir, tier)
+        tier += 1
+    return files
+
+
+def _merge_with_ffmpeg_concat(chunk_files: List[Path], output_file: Path) -> Tuple[bool, Optional[float]]:
     """
-    Executa o merge de todos os chunks processados usando FFmpeg.
+    Concatena os chunks com o demuxer concat do FFmpeg. Listas maiores que
+    TIER_SIZE são mergeadas em níveis para manter cada chamada pequena.
+    Retorna (sucesso, duração em segundos informada pelo FFmpeg).
+    """
+    print(f"\n🔄 Executando FFmpeg concat...")
+
+    if len(chunk_files) <= TIER_SIZE:
+        return _run_ffmpeg_concat(chunk_files, output_file)
+
+    tmpdir = Path(tempfile.mkdtemp(prefix='.merge_tiers_', dir=output_file.parent))
+    try:
+        files = asyncio.run(_merge_tiers(chunk_files, tmpdir))
+        return _run_ffmpeg_concat(files, output_file)
+    except RuntimeError as e:
+        print(f"❌ Erro no merge hierárquico: {e}")
+        return False, None
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def merge_processed_chunks(chunk_files: List[Path], output_file: Path, safe: bool = False) -> bool:
+    """
+    Executa o merge de todos os chunks processados.
+    Tenta a concatenação binária direta (exceto com safe=True), depois
+    mkvmerge quando disponível e FFmpeg concat como alternativa.
     """
     if not chunk_files:
         print("❌ Nenhum arquivo processado encontrado para mergear")
@@ -185,92 +586,81 @@ def merge_processed_chunks(chunk_files: List[Path], output_file: Path) -> bool:
     print(f"📁 Arquivo de saída: {output_file.name}")
     print(f"📊 Total de chunks: {len(chunk_files)}")
 
-    # Criar arquivo de lista temporário
-    list_file = output_file.parent / "concat_list.txt"
-
     try:
-        # Criar lista de concatenação
-        if not create_concat_list(chunk_files, list_file):
+        duration = None
+        merged = not safe and _try_binary_concat(chunk_files, output_file)
+        if not merged and check_mkvmerge():
+            merged, duration = _merge_with_mkvmerge(chunk_files, output_file)
+        if not merged:
+            merged, duration = _merge_with_ffmpeg_concat(chunk_files, output_file)
+        if not merged:
             return False
 
-        # Comando FFmpeg para concatenação
-        cmd = [
-            'ffmpeg',
-            '-f', 'concat',           # Usar modo concat
-            '-safe', '0',             # Permitir caminhos absolutos
-            '-i', str(list_file),     # Arquivo de lista
-            '-c', 'copy',             # Copiar streams sem re-encoding
-            '-y',                     # Sobrescrever se existir
-            str(output_file)
-        ]
-
-        print(f"\n🔄 Executando FFmpeg concat...")
-        print(f"💡 Comando: {' '.join(cmd[:6])} ... {output_file.name}")
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        print("✅ Merge concluído com sucesso!")
 
-        # Limpar arquivo de lista temporário
+        # Mostrar informações do arquivo resultante
         try:
-            list_file.unlink()
-            print("🧹 Arquivo de lista temporário removido")
-        except:
-            pass
-
-        if result.returncode == 0:
-            print("✅ Merge concluído com sucesso!")
-
-            # Mostrar informações do arquivo resultante
-            if output_file.exists():
-                size_mb = output_file.stat().st_size / (1024 * 1024)
-                print(f"📁 Tamanho do arquivo final: {size_mb:.1f} MB")
-                
-                # Verificar duração (opcional)
-                try:
-                    duration_cmd = [
-                        'ffprobe',
-                        '-v', 'quiet',
-                        '-print_format', 'json',
-                        '-show_format',
-                        str(output_file)
-                    ]
-                    duration_result = subprocess.run(duration_cmd, capture_output=True, text=True, check=False)
-                    if duration_result.returncode == 0:
-                        import json
-                        data = json.loads(duration_result.stdout)
-                        duration = float(data.get('format', {}).get('duration', 0))
-                        if duration > 0:
-                            minutes = int(duration // 60)
-                            seconds = duration % 60
-                            print(f"⏱️  Duração: {minutes}m {seconds:.1f}s")
-                except:
-                    pass
+            st = output_file.stat()
+        except FileNotFoundError:
+            st = None
+        if st:
+            size_mb = st.st_size / (1024 * 1024)
+            print(f"📁 Tamanho do arquivo final: {size_mb:.1f} MB")
+            
+            # Duração reportada pelo próprio FFmpeg (quando houve remux)
+            if duration and duration > 0:
+                minutes = int(duration // 60)
+                seconds = duration % 60
+                print(f"⏱️  Duração: {minutes}m {seconds:.1f}s")
 
-            return True
-        else:
-            print("❌ Erro no FFmpeg concat")
-            if result.stderr:
-                print(f"📄 Detalhes do erro: {result.stderr}")
-            return False
+        return True
 
     except Exception as e:
         print(f"❌ Erro durante o merge: {e}")
-        # Limpar arquivo de lista em caso de erro
-        try:
-            if list_file.exists():
-                list_file.unlink()
-        except:
-            pass
         return False
 
 
-def check_ffmpeg() -> bool:
-    """Verifica se FFmpeg está disponível."""
+def _check_tool(name: str, version_flag: str) -> bool:
+    """
+    Verifica se um executável está disponível. O resultado positivo fica
+    em cache (~/.cache/subrim/<nome>_ok) chaveado por caminho+mtime+tamanho
+    do binário, evitando o fork+exec de "<tool> -version" a cada execução.
+    """
+    tool_path = shutil.which(name)
+    if not tool_path:
+        return False
+
+    cache_file = TOOL_CACHE_DIR / f"{name}_ok"
+    st = os.stat(tool_path)
+    key = f"{tool_path}:{st.st_mtime_ns}:{st.st_size}"
     try:
-        subprocess.run(['ffmpeg', '-version'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
-        return True
+        if cache_file.read_text(encoding='utf-8') == key:
+            return True
+    except OSError:
+        pass
+
+    try:
+        subprocess.run([tool_path, version_flag], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
 
+    try:
+        TOOL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(key, encoding='utf-8')
+    except OSError:
+        pass
+    return True
+
+
+def check_ffmpeg() -> bool:
+    """Verifica se FFmpeg está disponível."""
+    return _check_tool('ffmpeg', '-version')
+
+
+def check_mkvmerge() -> bool:
+    """Verifica se mkvmerge (MKVToolNix) está disponível."""
+    return _check_tool('mkvmerge', '--version')
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -282,20 +672,27 @@ Funcionamento detalhado:
   2. Verifica se existem arquivos *_processed.mp4 na ordem sequencial
   3. Cria arquivos _processed faltantes copiando os originais
   4. Imprime lista completa de arquivos processados
-  5. Executa merge usando FFmpeg
+  5. Executa merge usando mkvmerge (se instalado) ou FFmpeg
 
 Exemplos:
   python3 merge_chunks.py mulher13     # Processa pasta mulher13_sub/
   python3 merge_chunks.py onibus152    # Processa pasta onibus152_sub/
+  python3 merge_chunks.py mulher13 --safe  # Sem concatenação binária direta
+  python3 merge_chunks.py mulher13 --force # Mergear mesmo se já estiver atualizado
 
 Requisitos:
   - FFmpeg deve estar instalado
+  - mkvmerge (MKVToolNix) é opcional e acelera o merge
   - Pasta <directory_name>_sub deve existir no diretório assets
   - Chunks devem seguir padrão: *_chunk_XXX.mp4
         """
     )
 
     parser.add_argument('directory', help='Nome do diretório (sem _sub)')
+    parser.add_argument('--force', action='store_true',
+                       help='Mergear mesmo se o arquivo final estiver atualizado')
+    parser.add_argument('--safe', action='store_true',
+                       help='Não tentar a concatenação binária direta; sempre remuxar com mkvmerge/FFmpeg')
 
     args = parser.parse_args()
 
@@ -328,19 +725,21 @@ Requisitos:
         
         # Etapa 1: Validar e criar arquivos processados faltantes
         print(f"\n📋 ETAPA 1: Validação de chunks processados")
-        processed_chunks, created_files = validate_and_create_missing_processed(source_dir)
+        final_file_list, created_files = validate_and_create_missing_processed(source_dir)
 
-        if not processed_chunks:
+        if not final_file_list:
             print("❌ Nenhum chunk processado disponível")
             return 1
 
+        # Nada mudou desde o último merge: evitar remux completo
+        if not args.force and not created_files and is_up_to_date(output_file, final_file_list):
+            print(f"\n✅ {output_file.name} já está atualizado (mais novo que todos os chunks)")
+            print("   Use --force para mergear novamente")
+            return 0
+
         # Etapa 2: Exibir lista completa de arquivos processados
         print(f"\n📋 ETAPA 2: Lista de arquivos para merge")
-        final_file_list = display_processed_files_list(processed_chunks)
-
-        if not final_file_list:
-            print("❌ Nenhum arquivo disponível para merge")
-            return 1
+        display_processed_files_list(final_file_list)
 
         # Verificar se arquivo de saída já existe
         if output_file.exists():
@@ -352,7 +751,7 @@ Requisitos:
 
         # Etapa 3: Executar merge
         print(f"\n📋 ETAPA 3: Merge final")
-        if merge_processed_chunks(final_file_list, output_file):
+        if merge_processed_chunks(final_file_list, output_file, safe=args.safe):
             print(f"\n🎉 PROCESSO CONCLUÍDO COM SUCESSO!")
             print(f"📊 Resumo:")
             print(f"   • Arquivos _processed criados: {len(created_files)}")
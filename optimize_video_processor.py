@@ -4,52 +4,98 @@ Script para otimizar o video_subtitle_printer_all_in_one.py
 Aplica duas otimizações:
 1. Preset 'medium' -> 'fast' (velocidade)
 2. Batch size 25 -> 10 (estabilidade)
+
+As alterações são localizadas pela AST (atribuição `batch_size = 25` e o
+valor que segue '-preset' nas listas de argumentos), então independem de
+comentários/espaçamento e o script pode ser executado várias vezes.
 """
 
+import ast
+
+
+def find_optimizations(source: str):
+    """
+    Retorna a lista de edições (nó, novo_texto, tipo) a aplicar no código-fonte.
+    """
+    tree = ast.parse(source)
+    edits = []
+
+    for node in ast.walk(tree):
+        # 1. batch_size = 25 -> 10
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name) and node.targets[0].id == 'batch_size'
+                and isinstance(node.value, ast.Constant) and node.value.value == 25):
+            edits.append((node.value, '10', 'batch'))
+
+        # 2. [..., '-preset', 'medium', ...] -> 'fast'
+        elif isinstance(node, (ast.List, ast.Tuple)):
+            for prev, elt in zip(node.elts, node.elts[1:]):
+                if (isinstance(prev, ast.Constant) and prev.value == '-preset'
+                        and isinstance(elt, ast.Constant) and elt.value == 'medium'):
+                    edits.append((elt, "'fast'", 'preset'))
+
+    return edits
+
+
+def apply_edits(source: str, edits) -> str:
+    """
+    Substitui o texto de cada nó editado. As posições da AST são em bytes
+    UTF-8, então a troca é feita sobre o código codificado.
+    """
+    data = source.encode('utf-8')
+    line_starts = [0]
+    for line in data.splitlines(keepends=True):
+        line_starts.append(line_starts[-1] + len(line))
+
+    spans = []
+    for node, new_text, _ in edits:
+        start = line_starts[node.lineno - 1] + node.col_offset
+        end = line_starts[node.end_lineno - 1] + node.end_col_offset
+        spans.append((start, end, new_text.encode('utf-8')))
+
+    # Aplicar de trás para frente para não deslocar as posições seguintes
+    for start, end, new_bytes in sorted(spans, reverse=True):
+        data = data[:start] + new_bytes + data[end:]
+
+    return data.decode('utf-8')
+
+
 def optimize_video_processor():
     file_path = "video_subtitle_printer_all_in_one.py"
-    
+
     print("🔧 Aplicando otimizações ao video_subtitle_printer_all_in_one.py...")
-    
+
     # Read the file
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
-    
+
     # Apply optimizations
+    edits = find_optimizations(content)
+    new_content = apply_edits(content, edits)
+
     changes_made = []
-    
-    # 1. Change batch size from 25 to 10
-    old_batch = "batch_size = 25  # Process 25 subtitles at a time to avoid extremely long filter chains"
-    new_batch = "batch_size = 10  # Process 10 subtitles at a time to avoid extremely long filter chains (optimized)"
-    if old_batch in content:
-        content = content.replace(old_batch, new_batch)
+    if any(kind == 'batch' for _, _, kind in edits):
         changes_made.append("✅ Batch size: 25 → 10 legendas por lote")
-    
-    # 2. Change preset from medium to fast (both occurrences)
-    old_preset = "'-preset', 'medium',"
-    new_preset = "'-preset', 'fast',    # Changed from 'medium' to 'fast' for better speed"
-    
-    # Count occurrences
-    preset_count = content.count(old_preset)
+
+    preset_count = sum(1 for _, _, kind in edits if kind == 'preset')
     if preset_count > 0:
-        content = content.replace(old_preset, new_preset)
         changes_made.append(f"✅ FFmpeg preset: 'medium' → 'fast' ({preset_count} locais)")
-    
-    # Write the updated file
-    if changes_made:
+
+    # Write the updated file (somente se o conteúdo mudou)
+    if new_content != content:
         with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
+            f.write(new_content)
+
         print("\n🎉 Otimizações aplicadas com sucesso!")
         for change in changes_made:
             print(f"   {change}")
-        
+
         print(f"\n📊 Benefícios esperados:")
         print(f"   ⚡ Velocidade: ~30-50% mais rápido")
         print(f"   💾 Tamanho: Arquivos ligeiramente maiores (mas muito menos que CRF 18)")
         print(f"   🔧 Estabilidade: Menos filtros por comando, mais confiável")
         print(f"   📦 Lotes: 744 legendas = ~75 lotes de 10 cada (vs 30 lotes de 25)")
-        
+
     else:
         print("⚠️  Nenhuma mudança necessária - arquivo já otimizado")
 
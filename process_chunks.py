@@ -20,51 +20,226 @@ Características:
 
 import sys
 import argparse
+import logging
+import logging.handlers
+import multiprocessing
+import time
 import shutil
 import subprocess
 import os
+import selectors
 import tempfile
+import functools
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import re
 
+# Pillow é opcional: quando disponível, mede a largura real das palavras
+try:
+    from PIL import ImageFont
+except ImportError:
+    ImageFont = None
+
+
+logger = logging.getLogger(__name__)
+
+# Threads do FFmpeg reservadas para cada chunk processado em paralelo
+FFMPEG_THREADS_PER_WORKER = 4
+
+# Encoders H.264 em ordem de preferência (hardware primeiro, libx264 como fallback)
+H264_ENCODERS = ['h264_videotoolbox', 'h264_nvenc', 'h264_qsv', 'h264_vaapi', 'libx264']
+
+# Parâmetros de qualidade de cada encoder (equivalentes aproximados a CRF 20)
+ENCODER_ARGS = {
+    'h264_videotoolbox': ['-q:v', '65', '-pix_fmt', 'yuv420p'],
+    'h264_nvenc': ['-preset', 'p4', '-rc', 'vbr', '-cq', '20', '-pix_fmt', 'yuv420p'],
+    'h264_qsv': ['-preset', 'medium', '-global_quality', '20', '-pix_fmt', 'nv12'],
+    'h264_vaapi': ['-qp', '20'],
+    'libx264': ['-crf', '20', '-preset', 'fast', '-pix_fmt', 'yuv420p'],
+}
+
+VAAPI_DEVICE = '/dev/dri/renderD128'
+
+# Divisão de um chunk em partes codificadas em paralelo (quando sobram CPUs no pool)
+SPLIT_MIN_DURATION = 10.0  # Chunks mais curtos são codificados de uma vez
+SPLIT_MIN_SECONDS = 2.0    # Duração mínima de cada parte
+
+# Encoder detectado (cache por processo)
+_h264_encoder = None
+
+# Renderizador de legendas detectado: 'ass' (libass) ou 'drawtext' (cache por processo)
+_subtitle_renderer = None
+
+# Nomes de família das fontes candidatas (o libass procura fontes por nome, não por arquivo)
+FONT_FAMILIES = {
+    'STHeiti Medium.ttc': 'Heiti SC',
+    'STHeiti Light.ttc': 'Heiti SC',
+    'Arial Unicode.ttf': 'Arial Unicode MS',
+    'PingFang.ttc': 'PingFang SC',
+    'Hiragino Sans GB.ttc': 'Hiragino Sans GB',
+    'NotoSansCJK-Regular.ttc': 'Noto Sans CJK SC',
+    'LiberationSans-Regular.ttf': 'Liberation Sans',
+    'Arial.ttf': 'Arial',
+    'Helvetica.ttc': 'Helvetica',
+    'ArialHB.ttc': 'Arial Hebrew',
+    'HelveticaNeue.ttc': 'Helvetica Neue',
+    'DejaVuSans.ttf': 'DejaVu Sans',
+}
+
+# Regexes do parsing do base.txt (compiladas uma vez no import)
+_TS_RE = re.compile(r'([\d.]+)s?')
+_PAREN_RE = re.compile(r'^（(.*)）$')
+_QUOTED_RE = re.compile(r'"([^"]*)"')
+_ITEM_RE = re.compile(r'^([^\s\(]+)\s*\(([^)]+)\)\s*:\s*(.+)$')
+_CHIN_RE = re.compile(r'^([^\s\(]+)')
+
+# Caracteres que precisam de escape no texto do drawtext
+_FFMPEG_ESCAPE_RE = re.compile(r'([\\"\[\]%;,])')
+
+# Sequências de dígitos nos nomes dos chunks (ordenação natural)
+_NUM_RE = re.compile(r'(\d+)')
+
+# Espaços e pontuação removidos do texto chinês antes de agrupar as palavras
+_CLEAN_TBL = str.maketrans('', '', ' \u3000（）.《》"\u201c\u201d')
+
+# Filtro drawtext de uma palavra: (texto, x central, y, fonte, tamanho, cor, borda, condição de tempo)
+DRAWTEXT_WORD_FMT = ("drawtext=text=%s:x=%d-text_w/2:y=%d:fontfile='%s':fontsize=%d"
+                     ":fontcolor=%s:borderw=%d:bordercolor=black:enable='%s'")
+
+# Manifesto dos chunks já processados (evita relistar o diretório a cada execução)
+MANIFEST_NAME = '.processed_manifest.json'
+
+
+def natural_sort_key(name: str) -> list:
+    """Chave de ordenação que compara os números do nome como inteiros."""
+    return [int(part) if part.isdigit() else part for part in _NUM_RE.split(name)]
+
+
+def load_manifest(directory: Path) -> Optional[dict]:
+    """
+    Carrega o manifesto de chunks processados se ele ainda for válido,
+    ou seja, se foi gravado depois da última alteração do diretório.
+    """
+    manifest_path = directory / MANIFEST_NAME
+    try:
+        if manifest_path.stat().st_mtime_ns < directory.stat().st_mtime_ns:
+            return None
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(manifest.get('chunks'), list) or not isinstance(manifest.get('processed'), dict):
+        return None
+    return manifest
+
+
+def save_manifest(directory: Path, chunks: List[str], processed: Dict[str, list]) -> None:
+    """
+    Grava o manifesto de forma atômica. O mtime é ajustado depois do rename
+    para que o manifesto fique mais novo que o próprio diretório.
+    """
+    manifest_path = directory / MANIFEST_NAME
+    temp_path = directory / f"{MANIFEST_NAME}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'chunks': chunks, 'processed': processed}, f)
+        os.replace(temp_path, manifest_path)
+        os.utime(manifest_path)
+    except OSError as e:
+        logger.warning(f"   ⚠️  Não foi possível gravar o manifesto: {e}")
+
+
+def record_processed_chunk(chunk_path: Path) -> None:
+    """Registra no manifesto o _processed.mp4 recém-gerado de um chunk."""
+    directory = chunk_path.parent
+    processed_path = directory / f"{chunk_path.stem}_processed.mp4"
+    try:
+        st = processed_path.stat()
+    except OSError:
+        return
+
+    try:
+        with open(directory / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        chunks, processed = manifest['chunks'], manifest['processed']
+    except (OSError, ValueError, KeyError, TypeError):
+        # Sem manifesto utilizável: a próxima execução o reconstrói
+        return
+
+    processed[chunk_path.stem] = [st.st_mtime, st.st_size]
+    save_manifest(directory, chunks, processed)
+
 
 def find_chunk_files(directory: Path) -> Tuple[List[Path], List[Path]]:
     """
     Encontra todos os arquivos de chunk (MP4) no diretório,
     ordenados numericamente. Ignora arquivos *_processed.mp4.
 
+    Se o manifesto (.processed_manifest.json) for mais novo que o diretório,
+    ele é usado diretamente; caso contrário o diretório é relistado e o
+    manifesto reconstruído.
+
     Returns:
         Tuple[List[Path], List[Path]]: (todos_chunks_originais, chunks_sem_processed)
     """
-    all_chunk_files = []
-    unprocessed_chunk_files = []
+    manifest = load_manifest(directory)
+    if manifest is not None:
+        chunk_names = manifest['chunks']
+        processed = manifest['processed']
+        all_chunk_files = [directory / name for name in chunk_names]
+        unprocessed_chunk_files = [directory / name for name in chunk_names if name[:-4] not in processed]
+        return all_chunk_files, unprocessed_chunk_files
+
+    processed_entries = {}
+    chunk_entries = []
+
+    # Uma única listagem do diretório: os nomes servem tanto para achar os
+    # chunks quanto para saber quais já têm o _processed correspondente
+    with os.scandir(directory) as it:
+        for entry in it:
+            name = entry.name
+            if not name.endswith(".mp4") or name.startswith("."):
+                continue
 
-    # Procurar apenas por arquivos que contenham "chunk" no nome, mas NÃO contenham "_processed" ou "_temp"
-    for file_path in directory.glob("*chunk*.mp4"):
-        # Ignorar arquivos já processados (que terminam com _processed.mp4)
-        if "_processed" in file_path.name:
-            continue
+            if name.endswith("_processed.mp4"):
+                processed_entries[name[:-len("_processed.mp4")]] = entry
+                continue
 
-        # Ignorar arquivos temporários (que terminam com _temp.mp4)
-        if "_temp" in file_path.name:
-            continue
+            # Apenas arquivos com "chunk" no nome, ignorando *_temp
+            if "chunk" not in name or "_processed" in name or "_temp" in name:
+                continue
+            if entry.is_file(follow_symlinks=False):
+                chunk_entries.append((name, entry.path))
 
-        all_chunk_files.append(file_path)
+    # Ordenação natural (chunk_2 antes de chunk_10), mesmo sem zeros à esquerda
+    chunk_entries.sort(key=lambda item: natural_sort_key(item[0]))
 
-        # Verificar se já existe arquivo _processed correspondente
-        processed_file = file_path.parent / f"{file_path.stem}_processed.mp4"
-        if not processed_file.exists():
-            unprocessed_chunk_files.append(file_path)
+    all_chunk_files = [Path(path) for name, path in chunk_entries]
 
-    # Ordenar por nome (chunk_001, chunk_002, etc.)
-    all_chunk_files.sort(key=lambda x: x.name)
-    unprocessed_chunk_files.sort(key=lambda x: x.name)
+    # Verificar se já existe arquivo _processed correspondente
+    unprocessed_chunk_files = [
+        Path(path) for name, path in chunk_entries
+        if name[:-4] not in processed_entries
+    ]
+
+    # Reconstruir o manifesto com (mtime, tamanho) dos chunks já processados
+    processed = {}
+    for name, path in chunk_entries:
+        entry = processed_entries.get(name[:-4])
+        if entry is not None:
+            st = entry.stat()
+            processed[name[:-4]] = [st.st_mtime, st.st_size]
+    save_manifest(directory, [name for name, path in chunk_entries], processed)
 
     return all_chunk_files, unprocessed_chunk_files
 
 
-def process_chunk(chunk_path: Path, base_path: Path, chunk_number: int, total_chunks: int) -> bool:
+def process_chunk(chunk_path: Path, base_path: Path, chunk_number: int, total_chunks: int,
+                  ffmpeg_threads: int = 0, encoder: Optional[str] = None,
+                  renderer: Optional[str] = None) -> bool:
     """
     Função para processar um chunk individual.
     Aplica legendas ao vídeo do chunk usando o arquivo base.txt correspondente.
@@ -74,113 +249,362 @@ def process_chunk(chunk_path: Path, base_path: Path, chunk_number: int, total_ch
         base_path: Caminho para o arquivo base.txt do chunk
         chunk_number: Número do chunk (1, 2, 3...)
         total_chunks: Total de chunks sendo processados
+        ffmpeg_threads: Threads do FFmpeg por chunk (0 = automático)
+        encoder: Encoder H.264 a usar (None = detectar)
+        renderer: 'ass' ou 'drawtext' (None = detectar)
 
     Returns:
         True se processamento bem-sucedido
     """
-    print(f"   🔄 Processando chunk {chunk_number:03d}/{total_chunks:03d}", flush=True)
-    print(f"   📁 Vídeo: {chunk_path.name}")
-    print(f"   📄 Base: {base_path.name}")
+    start_time = time.monotonic()
+    logger.debug(f"   🔄 Processando chunk {chunk_number:03d}/{total_chunks:03d}")
+    logger.debug(f"   📁 Vídeo: {chunk_path.name}")
+    logger.debug(f"   📄 Base: {base_path.name if base_path else '-'}")
 
     # Verificar se o arquivo base existe
     if not base_path or not base_path.exists():
-        print(f"   ⚠️  Arquivo base não encontrado: {base_path}")
+        logger.warning(f"   ⚠️  Arquivo base não encontrado: {base_path}")
         return False
 
     # Verificar se o chunk de vídeo existe
     if not chunk_path.exists():
-        print(f"   ⚠️  Arquivo de chunk não encontrado: {chunk_path}")
+        logger.warning(f"   ⚠️  Arquivo de chunk não encontrado: {chunk_path}")
         return False
 
     try:
         # Parse do arquivo base para obter as legendas
-        print("   📖 Lendo arquivo base...", flush=True)
+        logger.debug("   📖 Lendo arquivo base...")
         subtitles = parse_base_file(base_path)
 
         if not subtitles:
-            print("   ⚠️  Arquivo base.txt vazio - fazendo cópia do chunk original com tag _processed")
+            logger.debug("   ⚠️  Arquivo base.txt vazio - fazendo cópia do chunk original com tag _processed")
 
             # Criar caminho para o chunk processado
             processed_chunk_path = chunk_path.parent / f"{chunk_path.stem}_processed.mp4"
 
-            # Copiar o chunk original para o arquivo processado
+            # Hardlink do chunk original (sem copiar bytes); cópia se o FS não suportar
             try:
-                shutil.copy2(chunk_path, processed_chunk_path)
-                print(f"   ✅ Chunk copiado com sucesso: {processed_chunk_path.name}")
-                print(f"\n🎉 Processamento concluído! Chunk copiado como {processed_chunk_path.name}")
+                try:
+                    os.link(chunk_path, processed_chunk_path)
+                except OSError:
+                    shutil.copy2(chunk_path, processed_chunk_path)
+                logger.debug(f"   ✅ Chunk copiado com sucesso: {processed_chunk_path.name}")
+                logger.info(f"   ✅ [{chunk_number:03d}/{total_chunks:03d}] {chunk_path.name}: sem legendas, "
+                            f"copiado como {processed_chunk_path.name}")
                 return True
             except Exception as e:
-                print(f"   ❌ Erro ao copiar chunk: {e}")
+                logger.error(f"   ❌ Erro ao copiar chunk: {e}")
                 return False
 
-        print(f"   📝 Encontradas {len(subtitles)} legendas para o chunk", flush=True)
+        logger.debug(f"   📝 Encontradas {len(subtitles)} legendas para o chunk")
 
-        # Criar arquivo temporário para o resultado
+        # Criar arquivo temporário para o resultado (mesmo diretório, para o rename final)
         temp_output = chunk_path.parent / f"{chunk_path.stem}_temp.mp4"
 
         # Aplicar legendas ao chunk
-        print("   🎬 Aplicando legendas ao chunk...", flush=True)
-        success = apply_subtitles_to_chunk(chunk_path, subtitles, temp_output)
+        logger.debug("   🎬 Aplicando legendas ao chunk...")
+        success = apply_subtitles_to_chunk(chunk_path, subtitles, temp_output, ffmpeg_threads, encoder, renderer)
 
         if not success:
-            print("   ❌ Falha ao aplicar legendas ao chunk")
+            logger.error("   ❌ Falha ao aplicar legendas ao chunk")
             # Limpar arquivo temporário se existir
             if temp_output.exists():
                 temp_output.unlink()
             return False
 
-        # Criar cópia do resultado processado (ao invés de substituir o original)
+        # Publicar o resultado como _processed.mp4 (o original não é alterado).
+        # Renomear é atômico e não copia os bytes do vídeo codificado.
         processed_copy = chunk_path.parent / f"{chunk_path.stem}_processed.mp4"
-        print(f"   📋 Criando cópia processada: {processed_copy.name}")
+        logger.debug(f"   📋 Criando arquivo processado: {processed_copy.name}")
 
         try:
-            shutil.copy2(temp_output, processed_copy)
-            print(f"   ✅ Cópia processada criada: {processed_copy.name}")
-
-            # Limpar arquivo temporário após criar a cópia
-            temp_output.unlink()
-            print(f"   🗑️  Arquivo temporário removido: {temp_output.name}")
+            os.replace(temp_output, processed_copy)
+            logger.debug(f"   ✅ Arquivo processado criado: {processed_copy.name}")
 
         except Exception as copy_error:
-            print(f"   ⚠️  Aviso: Não foi possível criar cópia processada: {copy_error}")
-            # Limpar arquivo temporário em caso de erro na cópia
+            logger.warning(f"   ⚠️  Aviso: Não foi possível criar arquivo processado: {copy_error}")
+            # Limpar arquivo temporário em caso de erro ao renomear
             try:
                 if temp_output.exists():
                     temp_output.unlink()
-                    print(f"   🗑️  Arquivo temporário removido devido a erro na cópia")
+                    logger.debug(f"   🗑️  Arquivo temporário removido devido a erro ao renomear")
             except Exception as cleanup_error:
-                print(f"   ⚠️  Não foi possível remover arquivo temporário: {cleanup_error}")
+                logger.warning(f"   ⚠️  Não foi possível remover arquivo temporário: {cleanup_error}")
             return False
 
-        print("   ✅ Processamento concluído com sucesso", flush=True)
+        logger.info(f"   ✅ [{chunk_number:03d}/{total_chunks:03d}] {chunk_path.name}: "
+                    f"{len(subtitles)} legendas em {time.monotonic() - start_time:.1f}s")
         return True
 
     except Exception as e:
-        print(f"   ❌ Erro inesperado no processamento do chunk: {e}")
+        logger.error(f"   ❌ Erro inesperado no processamento do chunk: {e}")
         # Limpar arquivo temporário em caso de erro inesperado
         try:
             temp_output_path = chunk_path.parent / f"{chunk_path.stem}_temp.mp4"
             if temp_output_path.exists():
                 temp_output_path.unlink()
-                print(f"   🗑️  Arquivo temporário removido devido a erro inesperado")
+                logger.debug(f"   🗑️  Arquivo temporário removido devido a erro inesperado")
         except Exception as cleanup_error:
-            print(f"   ⚠️  Não foi possível remover arquivo temporário: {cleanup_error}")
+            logger.warning(f"   ⚠️  Não foi possível remover arquivo temporário: {cleanup_error}")
+        return False
+
+
+def init_worker_logging(log_queue, level: int) -> None:
+    """
+    Inicializador dos workers: envia os logs para a fila do processo principal,
+    que é o único a escrever no stdout.
+    """
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level)
+
+
+def copy_special_case_chunk(chunk_file: Path) -> bool:
+    """
+    Lógica especial para Death.Becomes.Her.1992.1080p.BluRay.H264.AAC_chromecast_chunk_115.mp4:
+    quando o processamento falha, usa uma cópia idêntica do chunk original.
+
+    Returns:
+        True se a cópia foi criada
+    """
+    if "Death.Becomes.Her.1992.1080p.BluRay.H264.AAC_chromecast_chunk_115.mp4" not in chunk_file.name:
+        return False
+
+    print(f"   🔄 Aplicando tratamento especial para {chunk_file.name}")
+    print(f"   📋 Fazendo cópia idêntica do chunk original...")
+
+    # Criar cópia idêntica do chunk original
+    processed_copy = chunk_file.parent / f"{chunk_file.stem}_processed.mp4"
+
+    try:
+        shutil.copy2(chunk_file, processed_copy)
+        print(f"   ✅ Cópia idêntica criada: {processed_copy.name}")
+        print(f"   📊 Tamanho: {processed_copy.stat().st_size} bytes")
+        return True
+    except Exception as copy_error:
+        print(f"   ❌ Falha ao criar cópia idêntica: {copy_error}")
         return False
 
 
 def check_ffmpeg() -> bool:
-    """Check if FFmpeg is available."""
+    """Check if FFmpeg is available and detect the best H.264 encoder."""
     try:
-        import subprocess
         subprocess.run(['ffmpeg', '-version'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
-        return True
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
 
+    detect_h264_encoder()
+    detect_subtitle_renderer()
+    return True
+
+
+def detect_subtitle_renderer() -> str:
+    """
+    Usa o filtro `ass` (libass) quando o FFmpeg foi compilado com ele;
+    caso contrário, volta para os filtros drawtext.
+    """
+    global _subtitle_renderer
+
+    if _subtitle_renderer is None:
+        try:
+            result = subprocess.run(['ffmpeg', '-hide_banner', '-filters'],
+                                    capture_output=True, text=True)
+            filters = {line.split()[1] for line in result.stdout.splitlines()
+                       if len(line.split()) > 1}
+        except FileNotFoundError:
+            filters = set()
+
+        _subtitle_renderer = 'ass' if 'ass' in filters else 'drawtext'
+
+    return _subtitle_renderer
+
+
+def encoder_works(encoder: str) -> bool:
+    """
+    Codifica um quadro sintético com o encoder. Encoders de hardware aparecem em
+    `ffmpeg -encoders` mesmo sem a GPU/driver correspondente, então a lista sozinha
+    não garante que funcionem.
+    """
+    cmd = ['ffmpeg', '-hide_banner', '-loglevel', 'error']
+    if encoder == 'h264_vaapi':
+        cmd += ['-vaapi_device', VAAPI_DEVICE]
+    cmd += ['-f', 'lavfi', '-i', 'color=c=black:s=256x256:d=0.1']
+    if encoder == 'h264_vaapi':
+        cmd += ['-vf', 'format=nv12,hwupload']
+    cmd += ['-frames:v', '1', '-c:v', encoder, *ENCODER_ARGS[encoder], '-f', 'null', '-']
+
+    try:
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+def detect_h264_encoder() -> str:
+    """
+    Detecta o primeiro encoder H.264 disponível em H264_ENCODERS.
+    Consulta `ffmpeg -encoders` apenas uma vez por processo e testa os
+    encoders de hardware com um quadro antes de escolhê-los.
+    """
+    global _h264_encoder
+
+    if _h264_encoder is None:
+        _h264_encoder = 'libx264'
+        try:
+            result = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                    capture_output=True, text=True)
+            available = {line.split()[1] for line in result.stdout.splitlines()
+                         if len(line.split()) > 1}
+        except FileNotFoundError:
+            available = set()
+
+        for encoder in H264_ENCODERS:
+            # VAAPI só funciona com o dispositivo de render presente
+            if encoder == 'h264_vaapi' and not os.path.exists(VAAPI_DEVICE):
+                continue
+            if encoder == 'libx264':
+                break
+            if encoder in available and encoder_works(encoder):
+                _h264_encoder = encoder
+                break
+
+    return _h264_encoder
+
+
+def write_filter_script(filter_complex: str, encoder: str, directory: Path) -> Path:
+    """
+    Grava o filtergraph em um arquivo para -filter_complex_script. Filtros drawtext
+    de chunks longos passam de dezenas de KB, o que pesa (ou estoura) a linha de comando.
+    """
+    if encoder == 'h264_vaapi':
+        # drawtext roda na CPU; envia os quadros prontos para a GPU no final
+        filter_complex += '; [v]format=nv12,hwupload[vhw]'
+
+    script_path = directory / f"filter_{encoder}.txt"
+    script_path.write_text(filter_complex, encoding='utf-8')
+    return script_path
+
+
+def build_encode_command(input_video: Path, filter_script: Path, output_video: Path,
+                         encoder: str, ffmpeg_threads: int = 0,
+                         segment: Optional[Tuple[float, Optional[float]]] = None,
+                         progress: bool = False) -> List[str]:
+    """
+    Monta o comando FFmpeg de renderização para o encoder escolhido.
+    O filtergraph vem de `filter_script` (ver write_filter_script).
+
+    Com `segment` (início, duração), codifica só esse trecho do vídeo, sem áudio,
+    mantendo os timestamps originais para que os tempos do drawtext continuem válidos.
+    Com `progress`, o FFmpeg escreve o progresso (chave=valor) no stdout.
+    """
+    # Sem a linha de status periódica no stderr
+    input_args = ['-nostats']
+    if progress:
+        input_args += ['-progress', 'pipe:1']
+    audio_args = [
+        '-map', '0:a',        # Map original audio
+        '-c:a', 'copy',       # Copy audio without re-encoding
+    ]
+    video_label = '[v]'
+
+    if encoder == 'h264_vaapi':
+        # O hwupload para a GPU é acrescentado ao filtergraph por write_filter_script
+        input_args += ['-vaapi_device', VAAPI_DEVICE]
+        video_label = '[vhw]'
+
+    if segment is not None:
+        start, length = segment
+        input_args += ['-copyts', '-ss', f"{start:.3f}"]
+        if length is not None:
+            input_args += ['-t', f"{length:.3f}"]
+        audio_args = ['-an']
+
+    return [
+        'ffmpeg',
+        *input_args,
+        '-i', str(input_video),
+        '-filter_complex_script', str(filter_script),
+        '-map', video_label,  # Map the filtered video output
+        '-c:v', encoder,      # Video codec
+        *audio_args,
+        *ENCODER_ARGS[encoder],
+        '-threads', str(ffmpeg_threads),  # Split CPU with the other workers
+        '-y',                 # Overwrite output
+        str(output_video)
+    ]
+
+
+def encode_split_parallel(input_video: Path, filter_script: Path, output_video: Path,
+                          encoder: str, video_duration: float, ffmpeg_threads: int) -> bool:
+    """
+    Codifica o chunk em partes paralelas e junta o resultado sem recodificar.
+
+    Cada parte lê seu trecho do vídeo original (-ss/-t na entrada, com -copyts para
+    manter os tempos do filtro), aplica o mesmo filtro e codifica com as threads
+    restantes. As partes são unidas com o concat demuxer (-c copy) e o áudio
+    original é copiado nesse passo final.
+
+    Returns:
+        True se o chunk foi codificado; False para usar a codificação única
+    """
+    parts = min(ffmpeg_threads // FFMPEG_THREADS_PER_WORKER, int(video_duration // SPLIT_MIN_SECONDS))
+    if parts < 2:
+        return False
+
+    part_threads = max(1, ffmpeg_threads // parts)
+    part_length = video_duration / parts
+    work_dir = Path(tempfile.mkdtemp(prefix=f".{output_video.stem}_parts_", dir=output_video.parent))
+    part_files = [work_dir / f"part_{i:03d}.mp4" for i in range(parts)]
+
+    logger.debug(f"   ✂️  Dividindo em {parts} partes de ~{part_length:.1f}s ({part_threads} threads cada)")
+
+    def encode_part(i: int) -> subprocess.CompletedProcess:
+        start = i * part_length
+        # A última parte vai até o fim do vídeo
+        length = part_length if i < parts - 1 else None
+        cmd = build_encode_command(input_video, filter_script, part_files[i], encoder,
+                                   part_threads, segment=(start, length))
+        return subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+    try:
+        with ThreadPoolExecutor(max_workers=parts) as executor:
+            results = list(executor.map(encode_part, range(parts)))
+
+        for i, result in enumerate(results):
+            if result.returncode != 0:
+                logger.error(f"   ❌ Parte {i + 1}/{parts} falhou (código: {result.returncode})")
+                logger.error(f"   STDERR: {result.stderr[-2000:]}")
+                return False
+
+        # Caminhos relativos ao arquivo de lista
+        concat_list = work_dir / 'parts.txt'
+        concat_list.write_text(''.join(f"file '{part.name}'\n" for part in part_files), encoding='utf-8')
+
+        cmd = [
+            'ffmpeg', '-hide_banner', '-loglevel', 'error',
+            '-f', 'concat', '-safe', '0', '-i', str(concat_list),
+            '-i', str(input_video),
+            '-map', '0:v', '-map', '1:a',
+            '-c', 'copy',
+            '-y', str(output_video)
+        ]
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if result.returncode != 0:
+            logger.error(f"   ❌ Erro ao juntar as partes (código: {result.returncode})")
+            logger.error(f"   STDERR: {result.stderr}")
+            return False
+
+        return True
+
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
 
+
+@functools.lru_cache(maxsize=4096)
 def parse_pinyin_translations(translation_list_str: str) -> list[tuple[str, str, str]]:
     """
     Parse the translation list string to extract Chinese characters, pinyin, and Portuguese translations.
+    Results are cached per string (repeated lines are common): do not modify the returned list.
 
     Args:
         translation_list_str: String like '["三 (sān): três", "號 (hào): número", "碼頭 (mǎ tóu): cais"]'
@@ -199,14 +623,13 @@ def parse_pinyin_translations(translation_list_str: str) -> list[tuple[str, str,
         content = translation_list_str[1:-1]  # Remove [ and ]
 
         # Split by ", " but keep the quotes
-        import re
-        items = re.findall(r'"([^"]*)"', content)
+        items = _QUOTED_RE.findall(content)
 
         result = []
         for item in items:
             # Parse format: "三 (sān): três"
             # Extract Chinese characters, pinyin, and Portuguese translation
-            match = re.match(r'^([^\s\(]+)\s*\(([^)]+)\)\s*:\s*(.+)$', item)
+            match = _ITEM_RE.match(item)
             if match:
                 chinese_chars = match.group(1).strip()
                 pinyin = match.group(2).strip()
@@ -214,7 +637,7 @@ def parse_pinyin_translations(translation_list_str: str) -> list[tuple[str, str,
                 result.append((chinese_chars, pinyin, portuguese))
             else:
                 # Fallback: try to extract just Chinese chars if format doesn't match
-                chinese_match = re.match(r'^([^\s\(]+)', item)
+                chinese_match = _CHIN_RE.match(item)
                 if chinese_match:
                     chinese_chars = chinese_match.group(1)
                     result.append((chinese_chars, "", ""))  # Empty pinyin/portuguese
@@ -222,7 +645,7 @@ def parse_pinyin_translations(translation_list_str: str) -> list[tuple[str, str,
         return result
 
     except Exception as e:
-        print(f"Erro ao fazer parsing da lista de traduções com pinyin: {e}")
+        logger.warning(f"Erro ao fazer parsing da lista de traduções com pinyin: {e}")
         return []
 
 
@@ -244,7 +667,8 @@ def parse_base_file(base_file_path: Path) -> Dict[float, Tuple[str, str, str, st
 
     try:
         with open(base_file_path, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
+            # Read the whole file at once and split in C instead of iterating the text wrapper
+            for line in f.read().split('\n'):
                 line = line.strip()
                 if not line:
                     continue
@@ -261,7 +685,7 @@ def parse_base_file(base_file_path: Path) -> Dict[float, Tuple[str, str, str, st
                 begin_timestamp_str = parts[1].strip()
 
                 # Extract seconds from begin timestamp (e.g., "186.645s" -> 186.645)
-                begin_match = re.match(r'([\d.]+)s?', begin_timestamp_str)
+                begin_match = _TS_RE.match(begin_timestamp_str)
                 if not begin_match:
                     continue
 
@@ -271,7 +695,7 @@ def parse_base_file(base_file_path: Path) -> Dict[float, Tuple[str, str, str, st
                 duration = 3.0  # Default duration
                 if is_new_format:
                     end_timestamp_str = parts[2].strip()
-                    end_match = re.match(r'([\d.]+)s?', end_timestamp_str)
+                    end_match = _TS_RE.match(end_timestamp_str)
                     if end_match:
                         end_seconds = float(end_match.group(1))
                         duration = max(0.5, end_seconds - begin_seconds)  # Minimum 0.5 second duration
@@ -289,23 +713,25 @@ def parse_base_file(base_file_path: Path) -> Dict[float, Tuple[str, str, str, st
                     portuguese_text = parts[4].strip() if len(parts) >= 5 else ""
 
                 # Remove parentheses if present
-                chinese_text = re.sub(r'^（(.*)）$', r'\1', chinese_text)
+                chinese_text = _PAREN_RE.sub(r'\1', chinese_text)
 
                 # Keep original JSON string for translations
                 translations_json = translations_text
 
                 # Parse translations list if it exists
                 if translations_text and translations_text != 'N/A':
+                    # The column is written with json.dumps: the C JSON parser handles escapes;
+                    # the quoted-item regex is only a fallback for non-JSON text
                     try:
-                        # Remove outer brackets and parse as list
-                        import ast
-                        translations_list = ast.literal_eval(translations_text)
-                        if isinstance(translations_list, list):
-                            # Join translations with line breaks
-                            formatted_translations = '\n'.join(translations_list)
-                        else:
-                            formatted_translations = translations_text
-                    except:
+                        translations_list = json.loads(translations_text)
+                    except ValueError:
+                        translations_list = _QUOTED_RE.findall(translations_text) or None
+                    if isinstance(translations_list, list) and all(
+                        isinstance(item, str) for item in translations_list
+                    ):
+                        # Join translations with line breaks
+                        formatted_translations = '\n'.join(translations_list)
+                    else:
                         # If parsing fails, use raw text
                         formatted_translations = translations_text
                 else:
@@ -320,11 +746,35 @@ def parse_base_file(base_file_path: Path) -> Dict[float, Tuple[str, str, str, st
                     subtitles[begin_seconds] = (chinese_text, formatted_translations, translations_json, portuguese_text, duration)
 
     except Exception as e:
-        print(f"Erro ao ler arquivo base {base_file_path}: {e}")
+        logger.error(f"Erro ao ler arquivo base {base_file_path}: {e}")
 
     return subtitles
 
 
+@functools.lru_cache(maxsize=None)
+def _list_font_dir(directory: str) -> frozenset:
+    """Nomes dos arquivos de um diretório de fontes (uma listagem por diretório)."""
+    try:
+        with os.scandir(directory) as it:
+            return frozenset(entry.name for entry in it)
+    except OSError:
+        return frozenset()
+
+
+def _first_existing_font(candidates: List[str]) -> str:
+    """Retorna a primeira fonte candidata que existe, ou 'arial'."""
+    for font_path in candidates:
+        if font_path == 'arial':
+            return font_path
+        directory, name = os.path.split(font_path)
+        if name in _list_font_dir(directory):
+            return font_path
+
+    # Final fallback
+    return 'arial'
+
+
+@functools.lru_cache(maxsize=1)
 def get_best_chinese_font() -> str:
     """Find the best available Chinese font for FFmpeg."""
     # List of Chinese fonts in order of preference (verified for this system)
@@ -340,14 +790,10 @@ def get_best_chinese_font() -> str:
         'arial',  # FFmpeg's built-in fallback
     ]
 
-    for font_path in chinese_fonts:
-        if font_path == 'arial' or Path(font_path).exists():
-            return font_path
-
-    # Final fallback
-    return 'arial'
+    return _first_existing_font(chinese_fonts)
 
 
+@functools.lru_cache(maxsize=1)
 def get_best_latin_font() -> str:
     """Find the best available Latin font for FFmpeg."""
     # List of Latin fonts in order of preference (verified for this system)
@@ -363,44 +809,36 @@ def get_best_latin_font() -> str:
         'arial',  # FFmpeg built-in fallback
     ]
 
-    for font_path in latin_fonts:
-        if font_path == 'arial' or Path(font_path).exists():
-            return font_path
-
-    # Final fallback
-    return 'arial'
+    return _first_existing_font(latin_fonts)
 
 
+@functools.lru_cache(maxsize=8192)
 def escape_ffmpeg_text(text: str) -> str:
-    """Escape text for FFmpeg drawtext filter using double quotes."""
+    """Escape text for FFmpeg drawtext filter using double quotes (cached: words repeat a lot)."""
     if not text or not isinstance(text, str):
         return ""
     
     # Remove any null bytes that could cause issues
-    text = text.replace('\x00', '')
-    
+    if '\x00' in text:
+        text = text.replace('\x00', '')
+
     # Strip whitespace and check if empty
     text = text.strip()
     if not text:
         return ""
-    
-    # Escape special characters for FFmpeg (using double quotes strategy)
-    text = text.replace('\\', '\\\\')  # Backslash
-    text = text.replace('"', '\\"')    # Double quote (since we'll use double quotes)
-    text = text.replace('[', '\\[')    # Left bracket
-    text = text.replace(']', '\\]')    # Right bracket
-    text = text.replace('%', '\\%')    # Percent sign
-    text = text.replace(';', '\\;')    # Semicolon
-    text = text.replace(',', '\\,')    # Comma (critical for FFmpeg parsing)
+
+    # Escape special characters for FFmpeg (using double quotes strategy) in a single pass:
+    # backslash, double quote, brackets, percent, semicolon and comma (critical for FFmpeg parsing)
     # NOTE: Single quotes, colons, and parentheses don't need escaping when using double quotes
-    
-    return text
+    return _FFMPEG_ESCAPE_RE.sub(r'\\\1', text)
 
 
+@functools.lru_cache(maxsize=8192)
 def wrap_portuguese_to_chinese_width(portuguese_text: str, font_path: str, max_width: int, font_size: int = 20) -> List[str]:
     """
     Break Portuguese text into multiple lines to fit within the Chinese word width.
     Never breaks words in the middle - only breaks at word boundaries.
+    Results are cached per (text, font, width, size): do not modify the returned list.
 
     Args:
         portuguese_text: Portuguese text to break
@@ -462,6 +900,128 @@ def wrap_portuguese_to_chinese_width(portuguese_text: str, font_path: str, max_w
     return lines
 
 
+def clean_chinese_text(chinese_text: str) -> str:
+    """Remove spaces and punctuation that are not rendered as words."""
+    return chinese_text.translate(_CLEAN_TBL)
+
+
+def group_chinese_words(clean_chinese: str, word_data: List[Tuple[str, str, str]]) -> List[Tuple[str, str, str]]:
+    """
+    Group Chinese characters into the words found in word_data (longest match first).
+    Characters without a translation become single-character items with empty pinyin/Portuguese.
+
+    Args:
+        clean_chinese: Chinese text without spaces/punctuation
+        word_data: List of (chinese_word, pinyin, portuguese) from parse_pinyin_translations
+
+    Returns:
+        List of (chinese_word, pinyin, portuguese) in text order
+    """
+    # Index words by text once; the first entry wins for duplicates, as in the list order
+    words = {}
+    for item in word_data:
+        words.setdefault(item[0], item)
+    lengths = sorted({len(word) for word in words}, reverse=True)
+
+    display_items = []
+    pos = 0
+    text_length = len(clean_chinese)
+
+    while pos < text_length:
+        # Try to find the longest matching word: one dict lookup per candidate length
+        for length in lengths:
+            item = words.get(clean_chinese[pos:pos + length])
+            if item:
+                display_items.append(item)
+                pos += length
+                break
+        else:
+            # Single character with no translation
+            display_items.append((clean_chinese[pos], "", ""))
+            pos += 1
+
+    return display_items
+
+
+@functools.lru_cache(maxsize=16)
+def load_measure_font(font_path: str, font_size: int):
+    """
+    Load a TrueType font for text measurement, cached per (font_path, size).
+    Returns None when Pillow is unavailable or the font cannot be loaded.
+    """
+    if ImageFont is None or font_path == 'arial':
+        return None
+    try:
+        return ImageFont.truetype(font_path, font_size)
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=8192)
+def measure_word_width(chinese_word: str, word_pinyin: str, chinese_font_size: int, pinyin_font_size: int,
+                       video_width: int, font_path: Optional[str] = None) -> int:
+    """
+    Horizontal space reserved for one word (Chinese word with pinyin above).
+    Cached: the same words repeat across the subtitles of a chunk.
+    """
+    cn_font = load_measure_font(font_path, chinese_font_size) if font_path else None
+    py_font = load_measure_font(font_path, pinyin_font_size) if cn_font else None
+
+    if cn_font and py_font:
+        # Largura real renderizada (medida pela fonte)
+        chinese_word_width = int(cn_font.getlength(chinese_word))
+        pinyin_width = int(py_font.getlength(word_pinyin)) if word_pinyin else 0
+    else:
+        # Calculate adaptive character widths based on font sizes (with safety margin)
+        chinese_char_width = int(chinese_font_size * 0.95)  # Increased from 0.85 to 0.95 for safety
+        pinyin_char_width = int(pinyin_font_size * 0.65)    # Increased from 0.6 to 0.65 for safety
+        chinese_word_width = len(chinese_word) * chinese_char_width
+        pinyin_width = len(word_pinyin) * pinyin_char_width if word_pinyin else 0
+
+    min_word_spacing = max(80, int(video_width * 0.05))  # Increased minimum spacing: 5% of width (was 4%)
+
+    # Use the wider of the two for spacing, with adaptive minimum + extra safety margin
+    base_word_width = max(chinese_word_width, pinyin_width, min_word_spacing)
+    # Add extra padding for safety (10% of base width, minimum 20px)
+    safety_padding = max(20, int(base_word_width * 0.10))
+    return base_word_width + safety_padding
+
+
+def calculate_word_widths(display_items: List[Tuple[str, str, str]], chinese_font_size: int,
+                          pinyin_font_size: int, video_width: int,
+                          font_path: Optional[str] = None) -> List[int]:
+    """
+    Calculate the horizontal space reserved for each word (Chinese word with pinyin above).
+
+    When Pillow is available and font_path is a real font file, widths are
+    measured with ImageFont.getlength; otherwise a per-character estimate is used.
+
+    Returns:
+        List of word widths in pixels, in display order
+    """
+    return [measure_word_width(chinese_word, word_pinyin or '', chinese_font_size, pinyin_font_size,
+                               video_width, font_path)
+            for chinese_word, word_pinyin, word_portuguese in display_items]
+
+
+def scale_word_widths(word_widths: List[int], max_width: int,
+                      total_line_width: Optional[int] = None) -> List[int]:
+    """
+    Scale word widths down proportionally when the line is wider than max_width.
+    Each word keeps a minimum width to avoid complete overlap.
+
+    total_line_width may be passed when the caller already has sum(word_widths).
+    """
+    if total_line_width is None:
+        total_line_width = sum(word_widths)
+    if total_line_width <= max_width:
+        return word_widths
+
+    scale_factor = max_width / total_line_width
+    min_word_width = 40  # Minimum width per word to avoid complete overlap
+    return [max(min_word_width, int(w * scale_factor)) for w in word_widths]
+
+
 def create_subtitle_background_filter(subtitle_area_height: int, subtitle_width: int, video_width: int, video_height: int, bottom_margin: int, time_condition: str = None) -> str:
     """
     Create a semi-transparent black background filter for the subtitle area.
@@ -495,7 +1055,7 @@ def create_subtitle_background_filter(subtitle_area_height: int, subtitle_width:
     return background_filter
 
 
-def create_ffmpeg_drawtext_filters(subtitles: Dict[float, Tuple[str, str, str, str, float]], video_width: int = 1920, video_height: int = 1080) -> str:
+def create_ffmpeg_drawtext_filters(subtitles: Dict[float, Tuple[str, str, str, str, float]], video_width: int = 1920, video_height: int = 1080) -> Optional[str]:
     """
     Create FFmpeg filters to render Chinese text, pinyin, and Portuguese translations with semi-transparent background.
 
@@ -505,17 +1065,20 @@ def create_ffmpeg_drawtext_filters(subtitles: Dict[float, Tuple[str, str, str, s
         video_height: Video height for positioning (default 1080)
 
     Returns:
-        FFmpeg filter string for drawtext operations with background
+        FFmpeg filter string for drawtext operations with background,
+        or None when there is nothing to draw (the video can be stream-copied)
     """
-    filter_parts = []
+    # Identical words (same text, position, font and colour) share one drawtext whose
+    # enable= is the OR of their time windows: (texto, x, y, fonte, tamanho, cor, borda) -> condições
+    word_filters = {}
 
     # Get appropriate font paths once for all subtitles
     chinese_font_path = get_best_chinese_font()
     latin_font_path = get_best_latin_font()
 
-    print(f"   🔤 Fonte chinesa: {chinese_font_path}")
-    print(f"   🔤 Fonte latina: {latin_font_path}")
-    print(f"   📐 Resolução do vídeo: {video_width}x{video_height}")
+    logger.debug(f"   🔤 Fonte chinesa: {chinese_font_path}")
+    logger.debug(f"   🔤 Fonte latina: {latin_font_path}")
+    logger.debug(f"   📐 Resolução do vídeo: {video_width}x{video_height}")
 
     # Calculate adaptive font sizes based on video resolution
     # Base the font sizes on video height, similar to the C code logic
@@ -527,8 +1090,8 @@ def create_ffmpeg_drawtext_filters(subtitles: Dict[float, Tuple[str, str, str, s
     # Aim to use about 85% of the video width for subtitles
     max_subtitle_width_pixels = int(video_width * 0.85)
 
-    print(f"   📝 Tamanhos adaptativos: Chinês={base_chinese_font_size}px, Pinyin={base_pinyin_font_size}px, PT={base_portuguese_font_size}px")
-    print(f"   📏 Largura máxima das legendas: {max_subtitle_width_pixels}px ({(max_subtitle_width_pixels/video_width)*100:.1f}% da tela)")
+    logger.debug(f"   📝 Tamanhos adaptativos: Chinês={base_chinese_font_size}px, Pinyin={base_pinyin_font_size}px, PT={base_portuguese_font_size}px")
+    logger.debug(f"   📏 Largura máxima das legendas: {max_subtitle_width_pixels}px ({(max_subtitle_width_pixels/video_width)*100:.1f}% da tela)")
 
     # Sort subtitles by time and validate content
     valid_subtitles = {}
@@ -541,7 +1104,7 @@ def create_ffmpeg_drawtext_filters(subtitles: Dict[float, Tuple[str, str, str, s
     # Limit number of subtitles to prevent FFmpeg filter complexity issues
     MAX_SUBTITLES = 200  # Process only first 1 subtitle to avoid timeouts and parsing errors
     if len(valid_subtitles) > MAX_SUBTITLES:
-        print(f"   ⚠️  Limiting to first {MAX_SUBTITLES} subtitle to prevent FFmpeg timeout (total: {len(valid_subtitles)})")
+        logger.warning(f"   ⚠️  Limiting to first {MAX_SUBTITLES} subtitle to prevent FFmpeg timeout (total: {len(valid_subtitles)})")
         # Keep only the first MAX_SUBTITLES by time
         limited_subtitles = {}
         for i, (begin_time, subtitle_data) in enumerate(sorted(valid_subtitles.items())):
@@ -551,10 +1114,10 @@ def create_ffmpeg_drawtext_filters(subtitles: Dict[float, Tuple[str, str, str, s
         valid_subtitles = limited_subtitles
 
     if not valid_subtitles:
-        print("   ⚠️  Nenhuma legenda válida encontrada, usando filtro de cópia")
-        return "[0:v]copy[v]"
+        logger.warning("   ⚠️  Nenhuma legenda válida encontrada, copiando o vídeo sem recodificar")
+        return None
 
-    print(f"   📊 Processando {len(valid_subtitles)} legendas válidas de {len(subtitles)} totais")
+    logger.debug(f"   📊 Processando {len(valid_subtitles)} legendas válidas de {len(subtitles)} totais")
 
     # Define variables needed for positioning calculations
     # Calculate margins based on font sizes for better proportions
@@ -565,12 +1128,19 @@ def create_ffmpeg_drawtext_filters(subtitles: Dict[float, Tuple[str, str, str, s
     # Calculate subtitle area dimensions for background
     # Find the minimum Y position (highest point) and maximum Y position (lowest point)
     # Also calculate the maximum width of subtitles
-    min_y = float('inf')
-    max_y = 0
     max_subtitle_width = 0
     background_filters = []
+    layouts = []
+
+    # Y positions do not depend on the subtitle: compute them once for the background
+    portuguese_y = video_height - bottom_margin - portuguese_extra_height - (base_portuguese_font_size // 2)
+    chinese_y = portuguese_y - vertical_spacing - base_chinese_font_size
+    pinyin_y = chinese_y - vertical_spacing - base_pinyin_font_size
+    min_y = pinyin_y
+    max_y = portuguese_y + base_portuguese_font_size + portuguese_extra_height
 
-    # First pass: collect all Y positions and calculate maximum subtitle width
+    # First pass: group words, calculate widths and the maximum subtitle width.
+    # The layout of each subtitle is kept for the second pass.
     for begin_time in sorted(valid_subtitles.keys()):
         chinese_text, translations_text, translations_json, portuguese_text, duration = valid_subtitles[begin_time]
 
@@ -578,65 +1148,24 @@ def create_ffmpeg_drawtext_filters(subtitles: Dict[float, Tuple[str, str, str, s
         word_data = parse_pinyin_translations(translations_json) if translations_json else []
 
         # Clean Chinese text
-        clean_chinese = chinese_text.replace(' ', '').replace('　', '').replace('（', '').replace('）', '').replace('.', '').replace('《', '').replace('》', '').replace('"', '').replace('"', '')
+        clean_chinese = clean_chinese_text(chinese_text)
 
         # Group characters into words and build display data
-        display_items = []
-        remaining_text = clean_chinese
-
-        while remaining_text:
-            found_word = False
-            for chinese_word, word_pinyin, word_portuguese in sorted(word_data, key=lambda x: len(x[0]), reverse=True):
-                if remaining_text.startswith(chinese_word):
-                    display_items.append((chinese_word, word_pinyin, word_portuguese))
-                    remaining_text = remaining_text[len(chinese_word):]
-                    found_word = True
-                    break
-            if not found_word:
-                char = remaining_text[0]
-                display_items.append((char, "", ""))
-                remaining_text = remaining_text[1:]
-
-        # Calculate Y positions for this subtitle
-        portuguese_y = video_height - bottom_margin - portuguese_extra_height - (base_portuguese_font_size // 2)
-        chinese_y = portuguese_y - vertical_spacing - base_chinese_font_size
-        pinyin_y = chinese_y - vertical_spacing - base_pinyin_font_size
-
-        # Track min and max Y positions
-        min_y = min(min_y, pinyin_y)
-        max_y = max(max_y, portuguese_y + base_portuguese_font_size + portuguese_extra_height)
+        display_items = group_chinese_words(clean_chinese, word_data)
 
         # Calculate width for this subtitle and track maximum
+        word_widths = calculate_word_widths(display_items, base_chinese_font_size, base_pinyin_font_size,
+                                            video_width, chinese_font_path)
+        total_line_width = sum(word_widths)
+        layouts.append((begin_time, duration, display_items, word_widths, total_line_width))
+
         if display_items:
-            # Calculate total width using the same logic as in the main loop
-            chinese_char_width = int(base_chinese_font_size * 0.95)
-            pinyin_char_width = int(base_pinyin_font_size * 0.65)
-            min_word_spacing = max(80, int(video_width * 0.05))
-
-            total_line_width = 0
-            word_widths = []
-
-            for chinese_word, word_pinyin, word_portuguese in display_items:
-                chinese_word_width = len(chinese_word) * chinese_char_width
-                pinyin_width = len(word_pinyin) * pinyin_char_width if word_pinyin else 0
-                base_word_width = max(chinese_word_width, pinyin_width, min_word_spacing)
-                safety_padding = max(20, int(base_word_width * 0.10))
-                word_width = base_word_width + safety_padding
-                word_widths.append(word_width)
-                total_line_width += word_width
-
-            # Apply scaling if needed
+            # Apply scaling only if the line does not fit
             if total_line_width > max_subtitle_width_pixels:
-                scale_factor = max_subtitle_width_pixels / total_line_width
-                min_word_width = 40
-                scaled_widths = []
-                for w in word_widths:
-                    scaled_width = max(min_word_width, int(w * scale_factor))
-                    scaled_widths.append(scaled_width)
-                word_widths = scaled_widths
-                total_line_width = sum(word_widths)
-
-            max_subtitle_width = max(max_subtitle_width, total_line_width)
+                scaled_width = sum(scale_word_widths(word_widths, max_subtitle_width_pixels, total_line_width))
+            else:
+                scaled_width = total_line_width
+            max_subtitle_width = max(max_subtitle_width, scaled_width)
 
     # Create background filter if we have subtitles
     if valid_subtitles and max_subtitle_width > 0:
@@ -646,7 +1175,7 @@ def create_ffmpeg_drawtext_filters(subtitles: Dict[float, Tuple[str, str, str, s
         # Create a time condition that covers all subtitle periods
         if len(valid_subtitles) == 1:
             # Single subtitle
-            begin_time = list(valid_subtitles.keys())[0]
+            begin_time = next(iter(valid_subtitles))
             duration = valid_subtitles[begin_time][4]
             end_time = begin_time + duration
             time_condition = f"between(t,{begin_time:.3f},{end_time:.3f})"
@@ -662,159 +1191,89 @@ def create_ffmpeg_drawtext_filters(subtitles: Dict[float, Tuple[str, str, str, s
         background_filter = create_subtitle_background_filter(background_height, background_width, video_width, video_height, bottom_margin, time_condition)
         background_filters.append(background_filter)
 
-    # Sort subtitles by time
-    for begin_time in sorted(valid_subtitles.keys()):
-        chinese_text, translations_text, translations_json, portuguese_text, duration = valid_subtitles[begin_time]
-
-        # Parse translations for pinyin and word-by-word Portuguese
-        word_data = parse_pinyin_translations(translations_json) if translations_json else []
-
-        # Clean Chinese text
-        clean_chinese = chinese_text.replace(' ', '').replace('　', '').replace('（', '').replace('）', '').replace('.', '').replace('《', '').replace('》', '').replace('"', '').replace('"', '')
-
-        # Group characters into words and build display data
-        display_items = []
-        remaining_text = clean_chinese
-
-        while remaining_text:
-            found_word = False
-
-            # Try to find the longest matching word
-            for chinese_word, word_pinyin, word_portuguese in sorted(word_data, key=lambda x: len(x[0]), reverse=True):
-                if remaining_text.startswith(chinese_word):
-                    display_items.append((chinese_word, word_pinyin, word_portuguese))
-                    remaining_text = remaining_text[len(chinese_word):]
-                    found_word = True
-                    break
-
-            if not found_word:
-                # Single character with no translation
-                char = remaining_text[0]
-                display_items.append((char, "", ""))
-                remaining_text = remaining_text[1:]
-
-        # Calculate adaptive positioning based on video height and font sizes
-        # Ensure subtitle area is large enough for the adaptive font sizes
-        min_subtitle_area = base_chinese_font_size + base_pinyin_font_size + (base_portuguese_font_size * 2) + 80  # Extra space for margins
-        subtitle_area_height = max(int(video_height * 0.25), min_subtitle_area)  # Use 25% of video height or minimum needed
-
-        # Variables already defined above
-
-        # Calculate total height needed for all elements (more conservative)
-        total_text_height = (base_pinyin_font_size + vertical_spacing +
-                           base_chinese_font_size + vertical_spacing +
-                           base_portuguese_font_size + portuguese_extra_height)
-
-        # Ensure we don't use more than 35% of screen height for subtitles
-        max_subtitle_height = int(video_height * 0.35)
-        if total_text_height > max_subtitle_height:
-            # Scale down spacing proportionally
-            scale_factor = max_subtitle_height / total_text_height
-            vertical_spacing = max(6, int(vertical_spacing * scale_factor))
-            portuguese_extra_height = int(portuguese_extra_height * scale_factor)
-            total_text_height = max_subtitle_height
-
-        # Calculate Y positions from bottom up, with safety margins
-        # Portuguese starts higher to avoid bottom crop (considering baseline positioning)
-        portuguese_y = video_height - bottom_margin - portuguese_extra_height - (base_portuguese_font_size // 2)
-        chinese_y = portuguese_y - vertical_spacing - base_chinese_font_size
-        pinyin_y = chinese_y - vertical_spacing - base_pinyin_font_size
-
-        # Safety check: ensure pinyin doesn't go off-screen at top
-        min_pinyin_y = base_pinyin_font_size + 15  # Keep at least 15px from top (increased)
-        if pinyin_y < min_pinyin_y:
-            # Recalculate with compressed layout
-            available_height = video_height - min_pinyin_y - bottom_margin - portuguese_extra_height
-            compressed_spacing = max(6, available_height // 8)  # Divide available space
-
-            pinyin_y = min_pinyin_y
-            chinese_y = pinyin_y + base_pinyin_font_size + compressed_spacing
-            portuguese_y = chinese_y + base_chinese_font_size + compressed_spacing
-
-            # Final safety check for bottom crop
-            max_portuguese_bottom = portuguese_y + base_portuguese_font_size + portuguese_extra_height
-            if max_portuguese_bottom > video_height - 10:
-                # Emergency compression - reduce font sizes if needed
-                overflow = max_portuguese_bottom - (video_height - 10)
-                portuguese_y -= overflow
+    # Calculate adaptive positioning based on video height and font sizes
+    # Ensure subtitle area is large enough for the adaptive font sizes
+    min_subtitle_area = base_chinese_font_size + base_pinyin_font_size + (base_portuguese_font_size * 2) + 80  # Extra space for margins
+    subtitle_area_height = max(int(video_height * 0.25), min_subtitle_area)  # Use 25% of video height or minimum needed
+
+    # Calculate total height needed for all elements (more conservative)
+    total_text_height = (base_pinyin_font_size + vertical_spacing +
+                       base_chinese_font_size + vertical_spacing +
+                       base_portuguese_font_size + portuguese_extra_height)
+
+    # Ensure we don't use more than 35% of screen height for subtitles
+    max_subtitle_height = int(video_height * 0.35)
+    if total_text_height > max_subtitle_height:
+        # Scale down spacing proportionally
+        scale_factor = max_subtitle_height / total_text_height
+        vertical_spacing = max(6, int(vertical_spacing * scale_factor))
+        portuguese_extra_height = int(portuguese_extra_height * scale_factor)
+        total_text_height = max_subtitle_height
+
+    # Calculate Y positions from bottom up, with safety margins
+    # Portuguese starts higher to avoid bottom crop (considering baseline positioning)
+    portuguese_y = video_height - bottom_margin - portuguese_extra_height - (base_portuguese_font_size // 2)
+    chinese_y = portuguese_y - vertical_spacing - base_chinese_font_size
+    pinyin_y = chinese_y - vertical_spacing - base_pinyin_font_size
+
+    # Safety check: ensure pinyin doesn't go off-screen at top
+    min_pinyin_y = base_pinyin_font_size + 15  # Keep at least 15px from top (increased)
+    if pinyin_y < min_pinyin_y:
+        # Recalculate with compressed layout
+        available_height = video_height - min_pinyin_y - bottom_margin - portuguese_extra_height
+        compressed_spacing = max(6, available_height // 8)  # Divide available space
+
+        pinyin_y = min_pinyin_y
+        chinese_y = pinyin_y + base_pinyin_font_size + compressed_spacing
+        portuguese_y = chinese_y + base_chinese_font_size + compressed_spacing
+
+        # Final safety check for bottom crop
+        max_portuguese_bottom = portuguese_y + base_portuguese_font_size + portuguese_extra_height
+        if max_portuguese_bottom > video_height - 10:
+            # Emergency compression - reduce font sizes if needed
+            overflow = max_portuguese_bottom - (video_height - 10)
+            portuguese_y -= overflow
+
+    # First subtitle times, used only to gate the debug output below
+    first_begin = min(subtitles)
+    first_valid_begin = min(valid_subtitles)
+
+    portuguese_line_height = int(base_portuguese_font_size * 1.2)  # Adaptive line height (120% of font size)
+
+    # Second pass: render each subtitle with the layout computed above
+    for begin_time, duration, display_items, word_widths, total_line_width in layouts:
 
         # Debug info for positioning (only for first subtitle to avoid spam)
-        if begin_time == sorted(subtitles.keys())[0]:
-            print(f"   📐 Posições Y adaptativas: Pinyin={pinyin_y}px, Chinês={chinese_y}px, PT={portuguese_y}px")
-            print(f"   📏 Área de legendas: {subtitle_area_height}px ({(subtitle_area_height/video_height)*100:.1f}% da altura)")
-            print(f"   🔵 Margem inferior: {bottom_margin}px, Espaçamento: {vertical_spacing}px")
-            print(f"   🛡️  Altura extra PT: {portuguese_extra_height}px, Altura total: {total_text_height}px")
+        if begin_time == first_begin:
+            logger.debug(f"   📐 Posições Y adaptativas: Pinyin={pinyin_y}px, Chinês={chinese_y}px, PT={portuguese_y}px")
+            logger.debug(f"   📏 Área de legendas: {subtitle_area_height}px ({(subtitle_area_height/video_height)*100:.1f}% da altura)")
+            logger.debug(f"   🔵 Margem inferior: {bottom_margin}px, Espaçamento: {vertical_spacing}px")
+            logger.debug(f"   🛡️  Altura extra PT: {portuguese_extra_height}px, Altura total: {total_text_height}px")
 
             # Check for potential cropping
             max_y_used = portuguese_y + base_portuguese_font_size + portuguese_extra_height
             bottom_clearance = video_height - max_y_used
             if bottom_clearance < 20:
-                print(f"   ⚠️  ATENÇÃO: Pouco espaço inferior ({bottom_clearance}px restantes)")
+                logger.warning(f"   ⚠️  ATENÇÃO: Pouco espaço inferior ({bottom_clearance}px restantes)")
             else:
-                print(f"   ✅ Espaço inferior seguro: {bottom_clearance}px restantes")
-
-        # Build text for each line with proper spacing
-        chinese_parts = []
-        pinyin_parts = []
-        portuguese_parts = []
-
-        for chinese_word, word_pinyin, word_portuguese in display_items:
-            chinese_parts.append(chinese_word)
-            if word_pinyin:
-                pinyin_parts.append(word_pinyin)
-            else:
-                pinyin_parts.append(' ')  # Placeholder to maintain alignment
-
-            if word_portuguese:
-                # Keep full Portuguese translation (no truncation)
-                portuguese_parts.append(word_portuguese)
-            else:
-                portuguese_parts.append('')  # Empty for words without translation
+                logger.debug(f"   ✅ Espaço inferior seguro: {bottom_clearance}px restantes")
 
         # Create word-by-word aligned subtitle with pinyin centered over each Chinese word
         # Calculate total line width first to center the entire subtitle block
-        total_line_width = 0
-        word_widths = []
-
-        # Calculate adaptive character widths based on font sizes (with safety margin)
-        chinese_char_width = int(base_chinese_font_size * 0.95)  # Increased from 0.85 to 0.95 for safety
-        pinyin_char_width = int(base_pinyin_font_size * 0.65)    # Increased from 0.6 to 0.65 for safety
-        min_word_spacing = max(80, int(video_width * 0.05))      # Increased minimum spacing: 5% of width (was 4%)
-
-        # Calculate width of each word for positioning
-        for chinese_word, word_pinyin, word_portuguese in display_items:
-            # Calculate adaptive word width based on resolution
-            chinese_word_width = len(chinese_word) * chinese_char_width
-            pinyin_width = len(word_pinyin) * pinyin_char_width if word_pinyin else 0
-
-            # Use the wider of the two for spacing, with adaptive minimum + extra safety margin
-            base_word_width = max(chinese_word_width, pinyin_width, min_word_spacing)
-            # Add extra padding for safety (10% of base width, minimum 20px)
-            safety_padding = max(20, int(base_word_width * 0.10))
-            word_width = base_word_width + safety_padding
-            word_widths.append(word_width)
-            total_line_width += word_width
-
         # If the line is too wide, scale down word widths proportionally to fit max_subtitle_width
         if total_line_width > max_subtitle_width:
             scale_factor = max_subtitle_width / total_line_width
 
             # Apply more conservative scaling to preserve minimum spacing
-            min_word_width = 40  # Minimum width per word to avoid complete overlap
-            scaled_widths = []
-            for w in word_widths:
-                scaled_width = max(min_word_width, int(w * scale_factor))
-                scaled_widths.append(scaled_width)
-
-            word_widths = scaled_widths
+            word_widths = scale_word_widths(word_widths, max_subtitle_width, total_line_width)
             total_line_width = sum(word_widths)
 
             # If still too wide after conservative scaling, try reducing font sizes instead
             if total_line_width > max_subtitle_width:
                 font_reduction_factor = max_subtitle_width / total_line_width
-                print(f"   📏 Linha ainda muito larga, reduzindo fontes por fator {font_reduction_factor:.2f}")
+                logger.debug(f"   📏 Linha ainda muito larga, reduzindo fontes por fator {font_reduction_factor:.2f}")
             else:
-                print(f"   📏 Linha muito larga, reduzida por fator {scale_factor:.2f} (conservativo)")
+                logger.debug(f"   📏 Linha muito larga, reduzida por fator {scale_factor:.2f} (conservativo)")
 
         # Calculate starting x position to center the entire line
         start_x = (video_width - total_line_width) // 2
@@ -828,25 +1287,30 @@ def create_ffmpeg_drawtext_filters(subtitles: Dict[float, Tuple[str, str, str, s
         pinyin_border_width = 0
         portuguese_border_width = 0
 
+        # Escape the Chinese and pinyin text of the whole line up front
+        escaped_chinese = [escape_ffmpeg_text(chinese_word) for chinese_word, _, _ in display_items]
+        escaped_pinyin = [escape_ffmpeg_text(word_pinyin) if word_pinyin else "" for _, word_pinyin, _ in display_items]
+
+        # Debug trace only for the first subtitle, decided once per line
+        trace_words = begin_time == first_valid_begin and logger.isEnabledFor(logging.DEBUG)
+
         # Add each word with its pinyin and Portuguese positioned individually
         current_x = start_x
         for i, (chinese_word, word_pinyin, word_portuguese) in enumerate(display_items):
             word_width = word_widths[i]
-
-            # Escape text for FFmpeg
-            chinese_escaped = escape_ffmpeg_text(chinese_word)
-            pinyin_escaped = escape_ffmpeg_text(word_pinyin) if word_pinyin else ""
+            chinese_escaped = escaped_chinese[i]
+            pinyin_escaped = escaped_pinyin[i]
 
             # Debug: Log first few words of the first subtitle to trace unexpected quotes rendered
-            if begin_time == sorted(valid_subtitles.keys())[0] and i < 5:
+            if trace_words and i < 5:
                 try:
-                    print(f"   🔎 RAW[{i}] zh='{chinese_word}' | py='{word_pinyin}' | pt='{word_portuguese}'")
-                    print(f"   🔎 ESC[{i}] zh='{chinese_escaped}' | py='{pinyin_escaped}'")
+                    logger.debug(f"   🔎 RAW[{i}] zh='{chinese_word}' | py='{word_pinyin}' | pt='{word_portuguese}'")
+                    logger.debug(f"   🔎 ESC[{i}] zh='{chinese_escaped}' | py='{pinyin_escaped}'")
                 except Exception:
                     pass
 
-            # Skip if Chinese text is empty after escaping
-            if not chinese_escaped or chinese_escaped.strip() == '':
+            # Skip if Chinese text is empty after escaping (escape_ffmpeg_text already strips)
+            if not chinese_escaped:
                 current_x += word_width
                 continue
 
@@ -854,217 +1318,442 @@ def create_ffmpeg_drawtext_filters(subtitles: Dict[float, Tuple[str, str, str, s
             word_center_x = current_x + word_width // 2
 
             # Chinese text (centered within word width) - using adaptive font size
-            chinese_filter = f'drawtext=text={chinese_escaped}:x={word_center_x}-text_w/2:y={chinese_y}:fontfile=\'{chinese_font_path}\':fontsize={base_chinese_font_size}:fontcolor=white:borderw={chinese_border_width}:bordercolor=black:enable=\'{time_condition}\''
-            if chinese_filter:  # Validate filter is not empty
-                filter_parts.append(chinese_filter)
+            word_filters.setdefault((chinese_escaped, word_center_x, chinese_y, chinese_font_path,
+                                     base_chinese_font_size, 'white', chinese_border_width), []).append(time_condition)
 
             # Pinyin text (centered over the Chinese word) - using adaptive font size
-            if pinyin_escaped and pinyin_escaped.strip():
-                pinyin_filter = f'drawtext=text={pinyin_escaped}:x={word_center_x}-text_w/2:y={pinyin_y}:fontfile=\'{chinese_font_path}\':fontsize={base_pinyin_font_size}:fontcolor=#9370DB:borderw={pinyin_border_width}:bordercolor=black:enable=\'{time_condition}\''
-                if pinyin_filter:  # Validate filter is not empty
-                    filter_parts.append(pinyin_filter)
+            if pinyin_escaped:
+                word_filters.setdefault((pinyin_escaped, word_center_x, pinyin_y, chinese_font_path,
+                                         base_pinyin_font_size, '#9370DB', pinyin_border_width), []).append(time_condition)
 
             # Portuguese text (centered below each Chinese word, with line breaks if needed) - using adaptive font size
             if word_portuguese and word_portuguese.strip():
                 portuguese_lines = wrap_portuguese_to_chinese_width(word_portuguese, latin_font_path, word_width, base_portuguese_font_size)
-                portuguese_line_height = int(base_portuguese_font_size * 1.2)  # Adaptive line height (120% of font size)
 
                 for line_idx, portuguese_line in enumerate(portuguese_lines):
                     if portuguese_line and portuguese_line.strip():  # Only add non-empty lines
                         portuguese_escaped = escape_ffmpeg_text(portuguese_line)
-                        if begin_time == sorted(valid_subtitles.keys())[0] and i < 5 and line_idx == 0:
+                        if trace_words and i < 5 and line_idx == 0:
                             try:
-                                print(f"   🔎 PT[{i}] line='{portuguese_line}' | esc='{portuguese_escaped}'")
+                                logger.debug(f"   🔎 PT[{i}] line='{portuguese_line}' | esc='{portuguese_escaped}'")
                             except Exception:
                                 pass
-                        if portuguese_escaped and portuguese_escaped.strip():  # Validate escaped text
+                        if portuguese_escaped:  # Validate escaped text (already stripped)
                             portuguese_line_y = portuguese_y + (line_idx * portuguese_line_height)
-                            portuguese_filter = f'drawtext=text={portuguese_escaped}:x={word_center_x}-text_w/2:y={portuguese_line_y}:fontfile=\'{latin_font_path}\':fontsize={base_portuguese_font_size}:fontcolor=yellow:borderw={portuguese_border_width}:bordercolor=black:enable=\'{time_condition}\''
-                            if portuguese_filter:  # Validate filter is not empty
-                                filter_parts.append(portuguese_filter)
+                            word_filters.setdefault((portuguese_escaped, word_center_x, portuguese_line_y,
+                                                     latin_font_path, base_portuguese_font_size, 'yellow',
+                                                     portuguese_border_width), []).append(time_condition)
 
             # Always increment current_x after processing this word, regardless of whether it has Portuguese
             current_x += word_width
 
-    # Format for filter complex script file - with validation
-    # Remove any empty or invalid filter parts
-    valid_filter_parts = [f for f in filter_parts if f and f.strip() and 'drawtext=' in f]
+    logger.debug(f"   🔧 Gerados {len(word_filters)} filtros de texto")
+    logger.debug(f"   🎨 Filtros de fundo: {len(background_filters)}")
 
-    print(f"   🔧 Gerados {len(valid_filter_parts)} filtros válidos de {len(filter_parts)} totais")
-    print(f"   🎨 Filtros de fundo: {len(background_filters)}")
+    # Background first, then the text filters, formatted straight into one list
+    # (no intermediate text-filter list and no concatenation copy)
+    all_filters = background_filters
+    all_filters.extend(DRAWTEXT_WORD_FMT % (*word_key, '+'.join(time_conditions))
+                       for word_key, time_conditions in word_filters.items())
 
-    # Combine background and text filters
-    all_filters = background_filters + valid_filter_parts
+    if not all_filters:
+        logger.warning("   ⚠️  Nenhum filtro válido criado, copiando o vídeo sem recodificar")
+        return None  # No filters: the caller stream-copies the video
 
-    if all_filters:
-        # Use pipeline approach for better reliability with many filters
-        if len(all_filters) == 1:
-            # Single filter case
-            return f"[0:v]{all_filters[0]}[v]"
-        else:
-            # Multiple filters - chain them sequentially
-            result_parts = []
-            current_input = "[0:v]"
-
-            for i, filter_part in enumerate(all_filters):
-                if i == len(all_filters) - 1:
-                    # Last filter outputs to [v]
-                    result_parts.append(f"{current_input}{filter_part}[v]")
-                else:
-                    # Intermediate filter
-                    temp_label = f"[tmp{i}]"
-                    result_parts.append(f"{current_input}{filter_part}{temp_label}")
-                    current_input = temp_label
+    # drawbox/drawtext are 1:1 video filters: one comma-separated chain,
+    # without intermediate [tmpN] pads between them
+    return "[0:v]" + ",".join(all_filters) + "[v]"
 
-            filter_result = "; ".join(result_parts)
 
-            # Final validation - ensure the result contains [v] output
-            if "[v]" not in filter_result:
-                print("   ⚠️  Filtro final não contém saída [v], usando cópia")
-                return "[0:v]copy[v]"
+def format_ass_time(seconds: float) -> str:
+    """Format seconds as an ASS timestamp (H:MM:SS.cc)."""
+    centiseconds = int(round(max(0.0, seconds) * 100))
+    hours, centiseconds = divmod(centiseconds, 360000)
+    minutes, centiseconds = divmod(centiseconds, 6000)
+    secs, centiseconds = divmod(centiseconds, 100)
+    return f"{hours}:{minutes:02d}:{secs:02d}.{centiseconds:02d}"
 
-            return filter_result
-    else:
-        print("   ⚠️  Nenhum filtro válido criado, usando filtro de cópia")
-        return "[0:v]copy[v]"  # No filters, just copy video
+
+def escape_ass_text(text: str) -> str:
+    """Escape text for an ASS Dialogue line (override braces, backslashes and line breaks)."""
+    text = text.replace('\\', '\\\\').replace('{', '\\{').replace('}', '\\}')
+    return text.replace('\n', ' ').replace('\r', '').strip()
+
+
+def create_ass_subtitles(subtitles: Dict[float, Tuple[str, str, str, str, float]], video_width: int = 1920, video_height: int = 1080) -> Optional[str]:
+    """
+    Create an ASS subtitle document with the same layout as create_ffmpeg_drawtext_filters:
+    pinyin above, Chinese in the middle and Portuguese below each word, over a
+    semi-transparent background box. Rendered by libass in a single filter.
+
+    Args:
+        subtitles: Dictionary mapping begin_time to subtitle data
+        video_width: Video width for positioning (default 1920)
+        video_height: Video height for positioning (default 1080)
+
+    Returns:
+        ASS document text, or None when no subtitle has anything to render
+    """
+    chinese_font_path = get_best_chinese_font()
+    latin_font_path = get_best_latin_font()
+    chinese_family = FONT_FAMILIES.get(os.path.basename(chinese_font_path), 'Arial')
+    latin_family = FONT_FAMILIES.get(os.path.basename(latin_font_path), 'Arial')
+
+    logger.debug(f"   🔤 Fonte chinesa: {chinese_font_path} ({chinese_family})")
+    logger.debug(f"   🔤 Fonte latina: {latin_font_path} ({latin_family})")
+
+    # Same adaptive sizes and positions as the drawtext renderer
+    chinese_font_size = max(24, min(120, int(video_height * 0.06)))
+    pinyin_font_size = int(chinese_font_size * 0.65)
+    portuguese_font_size = int(chinese_font_size * 0.45)
+    max_subtitle_width_pixels = int(video_width * 0.85)
+
+    bottom_margin = max(30, int(video_height * 0.04))
+    vertical_spacing = max(10, int(chinese_font_size * 0.20))
+    portuguese_extra_height = portuguese_font_size * 2
+    portuguese_line_height = int(portuguese_font_size * 1.2)
+
+    portuguese_y = video_height - bottom_margin - portuguese_extra_height - (portuguese_font_size // 2)
+    chinese_y = portuguese_y - vertical_spacing - chinese_font_size
+    pinyin_y = chinese_y - vertical_spacing - pinyin_font_size
+
+    # Group words and measure every subtitle line
+    lines = []
+    max_subtitle_width = 0
+    for begin_time in sorted(subtitles):
+        chinese_text, translations_text, translations_json, portuguese_text, duration = subtitles[begin_time]
+        if not chinese_text or not chinese_text.strip() or chinese_text == 'N/A':
+            continue
+
+        word_data = parse_pinyin_translations(translations_json) if translations_json else []
+        display_items = group_chinese_words(clean_chinese_text(chinese_text), word_data)
+        if not display_items:
+            continue
+
+        word_widths = calculate_word_widths(display_items, chinese_font_size, pinyin_font_size,
+                                            video_width, chinese_font_path)
+        word_widths = scale_word_widths(word_widths, max_subtitle_width_pixels)
+        max_subtitle_width = max(max_subtitle_width, sum(word_widths))
+        lines.append((begin_time, duration, display_items, word_widths))
+
+    logger.debug(f"   📊 Processando {len(lines)} legendas válidas de {len(subtitles)} totais (ASS)")
+
+    if not lines:
+        logger.warning("   ⚠️  Nenhuma legenda válida encontrada, copiando o vídeo sem recodificar")
+        return None
+
+    # One background box for all subtitles, like the drawbox of the drawtext renderer
+    background_height = (portuguese_y + portuguese_font_size + portuguese_extra_height) - pinyin_y + 10
+    background_width = max_subtitle_width + 40
+    background_x = (video_width - background_width) // 2
+    background_y = video_height - background_height - bottom_margin
+    background_shape = (f"m 0 0 l {background_width} 0 {background_width} {background_height} "
+                        f"0 {background_height}")
+
+    header = [
+        "[Script Info]",
+        "ScriptType: v4.00+",
+        f"PlayResX: {video_width}",
+        f"PlayResY: {video_height}",
+        "WrapStyle: 2",
+        "ScaledBorderAndShadow: yes",
+        "",
+        "[V4+ Styles]",
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+        "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, "
+        "Shadow, Alignment, MarginL, MarginR, MarginV, Encoding",
+        # Colors are &HAABBGGRR: white, #9370DB, yellow and black at 50%
+        f"Style: Chinese,{chinese_family},{chinese_font_size},&H00FFFFFF,&H00FFFFFF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,0,0,8,0,0,0,1",
+        f"Style: Pinyin,{chinese_family},{pinyin_font_size},&H00DB7093,&H00DB7093,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,0,0,8,0,0,0,1",
+        f"Style: Portuguese,{latin_family},{portuguese_font_size},&H0000FFFF,&H0000FFFF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,0,0,8,0,0,0,1",
+        "Style: Box,Arial,20,&H80000000,&H80000000,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,0,0,7,0,0,0,1",
+        "",
+        "[Events]",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    ]
+    events = []
+
+    for begin_time, duration, display_items, word_widths in lines:
+        start = format_ass_time(begin_time)
+        end = format_ass_time(begin_time + duration)
+
+        events.append(f"Dialogue: 0,{start},{end},Box,,0,0,0,,"
+                      f"{{\\pos({background_x},{background_y})\\p1}}{background_shape}")
+
+        # Center the whole line, then each word within its allocated width
+        current_x = (video_width - sum(word_widths)) // 2
+        for (chinese_word, word_pinyin, word_portuguese), word_width in zip(display_items, word_widths):
+            word_center_x = current_x + word_width // 2
+            current_x += word_width
+
+            chinese_escaped = escape_ass_text(chinese_word)
+            if not chinese_escaped:
+                continue
+
+            events.append(f"Dialogue: 1,{start},{end},Chinese,,0,0,0,,"
+                          f"{{\\pos({word_center_x},{chinese_y})}}{chinese_escaped}")
+
+            if word_pinyin and word_pinyin.strip():
+                events.append(f"Dialogue: 1,{start},{end},Pinyin,,0,0,0,,"
+                              f"{{\\pos({word_center_x},{pinyin_y})}}{escape_ass_text(word_pinyin)}")
+
+            if word_portuguese and word_portuguese.strip():
+                portuguese_lines = wrap_portuguese_to_chinese_width(word_portuguese, latin_font_path, word_width, portuguese_font_size)
+                for line_idx, portuguese_line in enumerate(portuguese_lines):
+                    portuguese_escaped = escape_ass_text(portuguese_line)
+                    if portuguese_escaped:
+                        portuguese_line_y = portuguese_y + (line_idx * portuguese_line_height)
+                        events.append(f"Dialogue: 1,{start},{end},Portuguese,,0,0,0,,"
+                                      f"{{\\pos({word_center_x},{portuguese_line_y})}}{portuguese_escaped}")
+
+    logger.debug(f"   🔧 Gerados {len(events)} eventos ASS")
+
+    return "\n".join(header + events) + "\n"
+
+
+def escape_filter_value(value: str) -> str:
+    """Escape a filter option value for both FFmpeg levels (option list and filtergraph)."""
+    for char in "\\':":
+        value = value.replace(char, '\\' + char)
+    for char in "\\',;[]":
+        value = value.replace(char, '\\' + char)
+    return value
+
+
+def create_ass_filter(ass_path: Path) -> str:
+    """Build the filter_complex that renders an ASS file with libass."""
+    # Chinese, pinyin and Portuguese need no complex shaping (no RTL/ligature
+    # scripts); simple shaping skips HarfBuzz for every rendered event
+    ass_filter = f"ass=filename={escape_filter_value(str(ass_path))}:shaping=simple"
+
+    # Let libass also load the fonts from the directory of the chosen Chinese font
+    fonts_dir = os.path.dirname(get_best_chinese_font())
+    if fonts_dir:
+        ass_filter += f":fontsdir={escape_filter_value(fonts_dir)}"
+
+    return f"[0:v]{ass_filter}[v]"
 
 
 def get_video_info(video_path: Path) -> Tuple[int, int, float]:
-    """Get video dimensions and duration using ffprobe."""
+    """Get video dimensions and duration using ffprobe (cached per file)."""
+    # Canonical path: relative and absolute spellings of the same chunk share one probe
+    return _probe_video_info(str(Path(video_path).resolve()))
+
+
+@functools.lru_cache(maxsize=None)
+def _probe_video_info(video_path: str) -> Tuple[int, int, float]:
+    """
+    Run ffprobe once per file. The duration falls back to the container's when the
+    stream does not report it (common for MKV/fragmented MP4).
+    """
     try:
         cmd = [
             'ffprobe',
             '-v', 'quiet',
-            '-print_format', 'csv=p=0',
+            '-print_format', 'json',
             '-select_streams', 'v:0',
-            '-show_entries', 'stream=width,height,duration',
-            str(video_path)
+            '-show_entries', 'stream=width,height,duration:format=duration',
+            video_path
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        parts = result.stdout.strip().split(',')
-        width = int(parts[0])
-        height = int(parts[1])
-        duration = float(parts[2]) if parts[2] and parts[2] != 'N/A' else 0.0
+        # Only stdout is used; stderr is discarded instead of captured ('-v quiet' anyway)
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True)
+        info = json.loads(result.stdout)
+        stream = info['streams'][0]
+        width = int(stream['width'])
+        height = int(stream['height'])
+        duration_str = stream.get('duration') or info.get('format', {}).get('duration')
+        duration = float(duration_str) if duration_str and duration_str != 'N/A' else 0.0
         return width, height, duration
-    except:
+    except Exception as e:
         # Default values if detection fails
+        logger.warning(f"   ⚠️  ffprobe falhou para {os.path.basename(video_path)} ({e}); usando 1920x1080")
         return 1920, 1080, 0.0
 
 
-def apply_subtitles_to_chunk(input_video: Path, subtitles: Dict[float, Tuple[str, str, str, str, float]], output_video: Path) -> bool:
+def stream_copy_chunk(input_video: Path, output_video: Path) -> bool:
+    """Copia vídeo e áudio do chunk sem recodificar (chunk sem legendas a desenhar)."""
+    cmd = [
+        'ffmpeg', '-hide_banner', '-loglevel', 'error',
+        '-i', str(input_video),
+        '-map', '0',
+        '-c', 'copy',
+        '-movflags', '+faststart',
+        '-y', str(output_video)
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        logger.error(f"   ❌ Erro ao copiar o chunk (código: {result.returncode})")
+        logger.error(f"   STDERR: {result.stderr}")
+        if output_video.exists():
+            output_video.unlink()
+        return False
+
+    logger.debug("   ✅ Chunk copiado sem recodificar (sem legendas a desenhar)")
+    return True
+
+
+def run_ffmpeg_with_progress(cmd: List[str], video_duration: float) -> Tuple[int, str]:
+    """
+    Executa o FFmpeg lendo stdout (progresso) e stderr ao mesmo tempo, para que
+    o processo nunca fique bloqueado com um dos pipes cheio.
+
+    Returns:
+        (código de saída, stderr)
     """
-    Apply subtitles to video chunk using FFmpeg drawtext filters.
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    last_progress = -1
+    stdout_buffer = b''
+    stderr_chunks = []
+
+    with selectors.DefaultSelector() as selector:
+        selector.register(process.stdout, selectors.EVENT_READ)
+        selector.register(process.stderr, selectors.EVENT_READ)
+
+        while selector.get_map():
+            for key, _ in selector.select():
+                data = os.read(key.fd, 65536)
+                if not data:
+                    selector.unregister(key.fileobj)
+                    continue
+
+                if key.fileobj is process.stderr:
+                    stderr_chunks.append(data)
+                    continue
+
+                *lines, stdout_buffer = (stdout_buffer + data).split(b'\n')
+                for line in lines:
+                    # Apenas as linhas de tempo interessam (out_time_ms está em microssegundos)
+                    if not line.startswith(b'out_time_ms=') or video_duration <= 0:
+                        continue
+                    value = line[12:].rstrip()
+                    if not value.isdigit():
+                        continue  # "N/A" antes do primeiro quadro
+
+                    progress_percent = min(100, int(int(value) / 10_000 / video_duration))
+                    if progress_percent > last_progress:
+                        last_progress = progress_percent
+                        logger.debug(f"   📊 Progresso: {last_progress:3d}%")
+
+    process.stdout.close()
+    process.stderr.close()
+    return_code = process.wait()
+    return return_code, b''.join(stderr_chunks).decode('utf-8', errors='replace')
+
+
+def apply_subtitles_to_chunk(input_video: Path, subtitles: Dict[float, Tuple[str, str, str, str, float]], output_video: Path,
+                             ffmpeg_threads: int = 0, encoder: Optional[str] = None,
+                             renderer: Optional[str] = None) -> bool:
+    """
+    Apply subtitles to video chunk using libass (ASS file) or FFmpeg drawtext filters.
 
     Args:
         input_video: Path to input MP4 chunk file
         subtitles: Dictionary with subtitle data
         output_video: Path to output MP4 file
+        ffmpeg_threads: FFmpeg encoder threads (0 = let FFmpeg decide)
+        encoder: H.264 encoder (None = auto-detect, falls back to libx264)
+        renderer: 'ass' or 'drawtext' (None = auto-detect libass)
 
     Returns:
         True if successful, False otherwise
     """
+    work_dir = None
+
     try:
         # Get video info for proper positioning
         video_width, video_height, video_duration = get_video_info(input_video)
-        print(f"   📐 Dimensões do chunk: {video_width}x{video_height}")
+        logger.debug(f"   📐 Dimensões do chunk: {video_width}x{video_height}")
         if video_duration > 0:
             duration_min = int(video_duration // 60)
             duration_sec = int(video_duration % 60)
-            print(f"   ⏱️  Duração do chunk: {duration_min}m{duration_sec:02d}s")
-
-        # Create drawtext filters for subtitles
-        drawtext_filters = create_ffmpeg_drawtext_filters(subtitles, video_width, video_height)
-
-        if not drawtext_filters:
-            print("   ⚠️  Nenhum filtro de legenda criado")
-            return False
-
-        # FFmpeg command for chunk processing - using filter_complex with proper syntax
-        cmd = [
-            'ffmpeg',
-            '-i', str(input_video),
-            '-filter_complex', drawtext_filters,
-            '-map', '[v]',       # Map the filtered video output
-            '-map', '0:a',       # Map original audio
-            '-c:v', 'libx264',   # Video codec
-            '-c:a', 'copy',      # Copy audio without re-encoding
-            '-crf', '20',        # High quality
-            '-preset', 'fast',   # Faster preset to avoid issues
-            '-pix_fmt', 'yuv420p',  # Compatible pixel format
-            '-y',                # Overwrite output
-            str(output_video)
-        ]
-
-        print(f"   🎬 Aplicando legendas ao chunk...")
-        print(f"   📂 Entrada: {input_video.name}")
-        print(f"   📂 Saída: {output_video.name}")
-
-        # Run FFmpeg with progress tracking
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
-        )
-
-        last_progress = -1
-        stderr_output = []
-
-        # Read progress from stdout
-        while True:
-            line = process.stdout.readline()
-            if not line and process.poll() is not None:
-                break
+            logger.debug(f"   ⏱️  Duração do chunk: {duration_min}m{duration_sec:02d}s")
+
+        renderer = renderer or detect_subtitle_renderer()
+        logger.debug(f"   🖋️  Renderizador: {renderer}")
+
+        # Arquivos auxiliares do FFmpeg (ASS e filtergraph), removidos no final
+        work_dir = Path(tempfile.mkdtemp(prefix='subrim_'))
+
+        if renderer == 'ass':
+            # One libass filter renders every subtitle, regardless of how many there are
+            ass_document = create_ass_subtitles(subtitles, video_width, video_height)
+            subtitle_filter = None
+            if ass_document is not None:
+                ass_path = work_dir / 'subtitles.ass'
+                ass_path.write_text(ass_document, encoding='utf-8')
+                subtitle_filter = create_ass_filter(ass_path)
+        else:
+            # Create drawtext filters for subtitles
+            subtitle_filter = create_ffmpeg_drawtext_filters(subtitles, video_width, video_height)
+
+        if subtitle_filter is None:
+            # Nada a desenhar: remux sem decodificar/recodificar
+            return stream_copy_chunk(input_video, output_video)
+
+        # Encoder por hardware quando disponível; libx264 como fallback
+        encoder = encoder or detect_h264_encoder()
+        encoders = [encoder] if encoder == 'libx264' else [encoder, 'libx264']
+
+        # Com CPUs sobrando (menos chunks que workers), dividir o chunk em partes paralelas
+        if video_duration >= SPLIT_MIN_DURATION and ffmpeg_threads >= 2 * FFMPEG_THREADS_PER_WORKER:
+            filter_script = write_filter_script(subtitle_filter, encoder, work_dir)
+            if encode_split_parallel(input_video, filter_script, output_video, encoder,
+                                     video_duration, ffmpeg_threads):
+                logger.debug(f"   ✅ Legendas aplicadas com sucesso ao chunk!")
+                return True
+            logger.debug("   🔄 Codificação em partes falhou, codificando o chunk inteiro...")
 
-            if line:
-                current_time = float(line.strip().split('=')[1]) if 'out_time_ms=' in line else None
-                if current_time is not None and video_duration > 0:
-                    progress_percent = min(100.0, (current_time / 1_000_000.0 / video_duration) * 100)
+        for encoder in encoders:
+            # FFmpeg command for chunk processing - using filter_complex with proper syntax
+            filter_script = write_filter_script(subtitle_filter, encoder, work_dir)
+            cmd = build_encode_command(input_video, filter_script, output_video, encoder, ffmpeg_threads,
+                                       progress=True)
 
-                    if int(progress_percent) > last_progress:
-                        last_progress = int(progress_percent)
-                        print(f"\r   📊 Progresso: {last_progress:3d}%", end='', flush=True)
+            logger.debug(f"   🎬 Aplicando legendas ao chunk...")
+            logger.debug(f"   📂 Entrada: {input_video.name}")
+            logger.debug(f"   📂 Saída: {output_video.name}")
+            logger.debug(f"   ⚙️  Encoder: {encoder}")
 
-        # Read stderr
-        stderr_data = process.stderr.read()
-        if stderr_data:
-            stderr_output.append(stderr_data)
+            # Run FFmpeg with progress tracking
+            return_code, stderr_output = run_ffmpeg_with_progress(cmd, video_duration)
 
-        # Wait for completion
-        return_code = process.wait()
+            if return_code == 0:
+                logger.debug(f"   ✅ Legendas aplicadas com sucesso ao chunk!")
+                return True
+            else:
+                logger.error(f"   ❌ Erro no FFmpeg (código: {return_code})")
+                if stderr_output:
+                    logger.error(f"   STDERR: {stderr_output}")
+                # Limpar arquivo de saída em caso de erro do FFmpeg
+                try:
+                    if output_video.exists():
+                        output_video.unlink()
+                        logger.debug(f"   🗑️  Arquivo de saída removido devido a erro no FFmpeg")
+                except Exception as cleanup_error:
+                    logger.warning(f"   ⚠️  Não foi possível remover arquivo de saída: {cleanup_error}")
 
-        print()  # New line after progress
+                if encoder != 'libx264':
+                    logger.debug(f"   🔄 Encoder {encoder} falhou, tentando libx264...")
 
-        if return_code == 0:
-            print(f"   ✅ Legendas aplicadas com sucesso ao chunk!")
-            return True
-        else:
-            print(f"   ❌ Erro no FFmpeg (código: {return_code})")
-            if stderr_output:
-                print(f"   STDERR: {''.join(stderr_output)}")
-            # Limpar arquivo de saída em caso de erro do FFmpeg
-            try:
-                if output_video.exists():
-                    output_video.unlink()
-                    print(f"   🗑️  Arquivo de saída removido devido a erro no FFmpeg")
-            except Exception as cleanup_error:
-                print(f"   ⚠️  Não foi possível remover arquivo de saída: {cleanup_error}")
-            return False
+        return False
 
     except Exception as e:
-        print(f"   ❌ Erro ao aplicar legendas ao chunk: {e}")
+        logger.error(f"   ❌ Erro ao aplicar legendas ao chunk: {e}")
         # Limpar arquivo de saída em caso de erro inesperado
         try:
             if output_video.exists():
                 output_video.unlink()
-                print(f"   🗑️  Arquivo de saída removido devido a erro inesperado")
+                logger.debug(f"   🗑️  Arquivo de saída removido devido a erro inesperado")
         except Exception as cleanup_error:
-            print(f"   ⚠️  Não foi possível remover arquivo de saída: {cleanup_error}")
+            logger.warning(f"   ⚠️  Não foi possível remover arquivo de saída: {cleanup_error}")
         return False
 
+    finally:
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -1073,6 +1762,7 @@ def main():
         epilog="""
 Exemplos:
   python3 process_chunks.py onibus132    # Processa apenas chunks não processados
+  python3 process_chunks.py onibus132 -j 2  # Dois chunks em paralelo
 
 Funcionamento (Idempotente):
   1. Encontra todos os chunks na pasta <directory_name>_sub
@@ -1097,9 +1787,18 @@ Para reprocessar:
     )
 
     parser.add_argument('directory', help='Nome do diretório (sem _sub)')
+    parser.add_argument('-j', '--workers', type=int, default=0,
+                        help=f'Chunks processados em paralelo (padrão: CPUs/{FFMPEG_THREADS_PER_WORKER})')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='Mostra o log detalhado de cada chunk')
+    parser.add_argument('--renderer', choices=['auto', 'ass', 'drawtext'], default='auto',
+                        help='Renderização das legendas: libass (ass) ou filtros drawtext (padrão: ass se disponível)')
 
     args = parser.parse_args()
 
+    log_level = logging.DEBUG if args.verbose else logging.INFO
+    logging.basicConfig(level=log_level, format='%(message)s', stream=sys.stdout)
+
     # Construct paths
     source_dir = Path('assets') / f"{args.directory}_sub"
 
@@ -1148,70 +1847,73 @@ Para reprocessar:
             print("💡 Para reprocessar, remova os arquivos *_processed.mp4")
             return 0
 
+        if not check_ffmpeg():
+            print("❌ FFmpeg não encontrado. Instale o FFmpeg para continuar.")
+            return 1
+
         # Process only unprocessed chunks
         processed_count = 0
         error_count = 0
+        failed_chunks = {}  # índice de envio -> nome, para o resumo em ordem
+
+        # Chunks são independentes: processar em paralelo, dividindo as CPUs
+        # entre os workers e as threads do FFmpeg de cada um
+        cpu_count = os.cpu_count() or 1
+        workers = args.workers or max(1, cpu_count // FFMPEG_THREADS_PER_WORKER)
+        workers = max(1, min(workers, len(unprocessed_chunk_files)))
+        ffmpeg_threads = max(1, cpu_count // workers)
 
         print("\n🎬 Iniciando processamento dos chunks não processados...")
+        renderer = detect_subtitle_renderer() if args.renderer == 'auto' else args.renderer
+        print(f"⚙️  Workers: {workers} | Threads FFmpeg por chunk: {ffmpeg_threads} | Encoder: {detect_h264_encoder()}")
+        print(f"🖋️  Renderizador de legendas: {renderer}")
         print("-" * 60)
 
-        for i, chunk_file in enumerate(unprocessed_chunk_files, 1):
-            # Find corresponding base file
-            base_file = chunk_file.parent / chunk_file.name.replace('.mp4', '_base.txt')
-
-            if not base_file.exists():
-                print(f"   ⚠️  Arquivo base não encontrado: {base_file.name}")
-                base_file = None
+        # Workers logam numa fila; um único listener escreve no stdout
+        log_queue = multiprocessing.Queue()
+        log_listener = logging.handlers.QueueListener(log_queue, *logging.getLogger().handlers)
+        log_listener.start()
 
-            # Process the chunk
-            try:
-                if process_chunk(chunk_file, base_file, i, len(unprocessed_chunk_files)):
-                    processed_count += 1
-                else:
-                    error_count += 1
-                    print(f"   ❌ Erro ao processar {chunk_file.name}")
-
-                    # Lógica especial para Death.Becomes.Her.1992.1080p.BluRay.H264.AAC_chromecast_chunk_115.mp4
-                    if "Death.Becomes.Her.1992.1080p.BluRay.H264.AAC_chromecast_chunk_115.mp4" in chunk_file.name:
-                        print(f"   🔄 Aplicando tratamento especial para {chunk_file.name}")
-                        print(f"   📋 Fazendo cópia idêntica do chunk original...")
-
-                        # Criar cópia idêntica do chunk original
-                        processed_copy = chunk_file.parent / f"{chunk_file.stem}_processed.mp4"
-
-                        try:
-                            shutil.copy2(chunk_file, processed_copy)
-                            print(f"   ✅ Cópia idêntica criada: {processed_copy.name}")
-                            print(f"   📊 Tamanho: {processed_copy.stat().st_size} bytes")
-                            processed_count += 1
-                            error_count -= 1  # Corrige a contagem pois agora foi "processado"
-                        except Exception as copy_error:
-                            print(f"   ❌ Falha ao criar cópia idêntica: {copy_error}")
-
-            except Exception as e:
-                error_count += 1
-                print(f"   ❌ Erro inesperado em {chunk_file.name}: {e}")
-
-                # Lógica especial para Death.Becomes.Her.1992.1080p.BluRay.H264.AAC_chromecast_chunk_115.mp4
-                if "Death.Becomes.Her.1992.1080p.BluRay.H264.AAC_chromecast_chunk_115.mp4" in chunk_file.name:
-                    print(f"   🔄 Aplicando tratamento especial para {chunk_file.name}")
-                    print(f"   📋 Fazendo cópia idêntica do chunk original...")
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker_logging,
+                                     initargs=(log_queue, log_level)) as executor:
+                futures = {}
+                for i, chunk_file in enumerate(unprocessed_chunk_files, 1):
+                    # Find corresponding base file
+                    base_file = chunk_file.parent / chunk_file.name.replace('.mp4', '_base.txt')
+
+                    if not base_file.exists():
+                        print(f"   ⚠️  Arquivo base não encontrado: {base_file.name}")
+                        base_file = None
+
+                    future = executor.submit(process_chunk, chunk_file, base_file, i,
+                                             len(unprocessed_chunk_files), ffmpeg_threads,
+                                             detect_h264_encoder(), renderer)
+                    futures[future] = (i, chunk_file)
+
+                for future in as_completed(futures):
+                    index, chunk_file = futures[future]
+
+                    # Process the chunk
+                    try:
+                        success = future.result()
+                        if not success:
+                            print(f"   ❌ Erro ao processar {chunk_file.name}")
+                    except Exception as e:
+                        success = False
+                        print(f"   ❌ Erro inesperado em {chunk_file.name}: {e}")
 
-                    # Criar cópia idêntica do chunk original
-                    processed_copy = chunk_file.parent / f"{chunk_file.stem}_processed.mp4"
+                    if not success:
+                        success = copy_special_case_chunk(chunk_file)
 
-                    try:
-                        shutil.copy2(chunk_file, processed_copy)
-                        print(f"   ✅ Cópia idêntica criada: {processed_copy.name}")
-                        print(f"   📊 Tamanho: {processed_copy.stat().st_size} bytes")
+                    if success:
                         processed_count += 1
-                        error_count -= 1  # Corrige a contagem pois agora foi "processado"
-                    except Exception as copy_error:
-                        print(f"   ❌ Falha ao criar cópia idêntica: {copy_error}")
-
-            # Add small delay between chunks for better readability
-            if i < len(unprocessed_chunk_files):
-                print()
+                        record_processed_chunk(chunk_file)
+                    else:
+                        error_count += 1
+                        failed_chunks[index] = chunk_file.name
+        finally:
+            log_listener.stop()
 
         # Summary
         print("\n" + "=" * 60)
@@ -1222,6 +1924,9 @@ Para reprocessar:
         print(f"🎯 Chunks processados agora: {processed_count}")
         print(f"✅ Sucesso: {processed_count}")
         print(f"❌ Erros: {error_count}")
+        # Os chunks terminam fora de ordem; o resumo lista as falhas na ordem dos chunks
+        for index in sorted(failed_chunks):
+            print(f"   ❌ {failed_chunks[index]}")
         print(f"💡 Arquivos originais: mantidos intactos")
 
         if error_count == 0:
@@ -35,23 +35,41 @@ AI API Support:
 
 If a ".env" file is present next to this script, variables defined there (e.g.,
 MARITACA_API_KEY, DEEPSEEK_API_KEY, DEEPSEEK_API_BASE, DEEPSEEK_MODEL) will be loaded if not
-already present in the environment.
+already present in the environment. LLM_CONCURRENCY (default 16) sets how many pair
+requests are in flight at once while generating the base file, and DEEPSEEK_BATCH
+(default 20) how many sentences go into each DeepSeek request. Extracted pairs are
+cached in ".llm_pairs_cache.json" next to this script, so re-runs only query new lines.
 """
 
 from __future__ import annotations
 
 import argparse
+from bisect import bisect_left, bisect_right
+import hashlib
+import http.client
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from itertools import accumulate
+from decimal import Decimal
 from pathlib import Path
 import re
 import os
 import json
 from urllib import request as urlrequest, error as urlerror
+from urllib.parse import urlsplit
 import sys
-import xml.etree.ElementTree as ET
+import threading
 import time
 
+# lxml parses and serializes in C; fall back to the stdlib ElementTree (same API)
+try:
+    from lxml import etree as ET
+    _HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _HAS_LXML = False
+
 
 # =============================================================================
 # EARLY ENVIRONMENT SETUP - Load .env before any other operations
@@ -86,9 +104,31 @@ NS_TTS = "http://www.w3.org/ns/ttml#styling"
 NS_NTTM = "http://www.netflix.com/ns/ttml#metadata"
 NS_XML = "http://www.w3.org/XML/1998/namespace"
 
+# Clark-notation names looked up per document/cue
+TICK_RATE_ATTR = f"{{{NS_TTP}}}tickRate"
+TTML_P_TAG = f"{{{NS_TTML}}}p"
+_P_DESCENDANT_PATH = f".//{TTML_P_TAG}"
+
+_namespaces_registered = False
+
+
+def _parse_xml(path: Path) -> ET.ElementTree:
+    """Parse an XML file. Under lxml, skip the xml:id table and libxml2's huge-document limits."""
+    if _HAS_LXML:
+        return ET.parse(str(path), parser=ET.XMLParser(collect_ids=False, huge_tree=True))
+    return ET.parse(path)
+
 
 def register_namespaces() -> None:
-    """Register known namespaces to preserve prefixes in output as much as possible."""
+    """Register known namespaces to preserve prefixes in output as much as possible.
+
+    The registry is process-wide, so this only does work on its first call.
+    """
+    global _namespaces_registered
+    # lxml keeps the source prefixes through each element's nsmap
+    if _HAS_LXML or _namespaces_registered:
+        return
+    _namespaces_registered = True
     # Preserve default TTML namespace
     ET.register_namespace("", NS_TTML)
     # Preserve commonly used prefixes present in the source
@@ -103,20 +143,36 @@ class TimingConversionConfig:
     tick_rate: int
 
 
+@lru_cache(maxsize=4096)
 def ticks_to_seconds_string(tick_value: int, tick_rate: int) -> str:
     """Convert a tick count to TTML seconds offset string (e.g., 12.345s).
 
-    Uses Decimal to avoid floating-point rounding issues, rounding to
-    milliseconds (3 decimal places, half-up).
+    Uses exact integer arithmetic, rounding to milliseconds (half-up).
+    Consecutive cues often repeat tick values, so results are memoized.
     """
     if tick_rate <= 0:
         raise ValueError("tick_rate must be positive")
 
-    total_seconds = (Decimal(tick_value) / Decimal(tick_rate)).quantize(
-        Decimal("0.001"), rounding=ROUND_HALF_UP
-    )
-    # Ensure fixed 3 decimal places and append TTML seconds suffix
-    return f"{format(total_seconds, '.3f')}s"
+    # Half-up rounding of tick_value * 1000 / tick_rate (ticks are never negative)
+    total_ms = (tick_value * 2000 + tick_rate) // (tick_rate * 2)
+    # Fixed 3 decimal places plus TTML seconds suffix
+    return _format_ms(total_ms)
+
+
+@lru_cache(maxsize=4096)
+def _convert_tick_value(raw_value: str, tick_rate: int) -> str | None:
+    """Seconds string for a raw '<ticks>t' value, or None when it is not plain ticks.
+
+    Memoized on the raw string: a cue's end is often the next cue's begin, and
+    nested elements repeat their parent's timings.
+    """
+    # Only convert values explicitly in ticks (ending with 't')
+    if raw_value.endswith("t"):
+        numeric_part = raw_value[:-1]
+        if numeric_part.isdigit():
+            return ticks_to_seconds_string(int(numeric_part), tick_rate)
+    # If non-digit content precedes 't', leave unchanged (could be expressions we don't parse)
+    return None
 
 
 def convert_timing_attributes(element: ET.Element, config: TimingConversionConfig) -> None:
@@ -126,14 +182,9 @@ def convert_timing_attributes(element: ET.Element, config: TimingConversionConfi
         if not raw_value:
             continue
 
-        # Only convert values explicitly in ticks (ending with 't')
-        if raw_value.endswith("t"):
-            numeric_part = raw_value[:-1]
-            if numeric_part.isdigit():
-                tick_value = int(numeric_part)
-                seconds_value = ticks_to_seconds_string(tick_value, config.tick_rate)
-                element.set(attribute_name, seconds_value)
-            # If non-digit content precedes 't', leave unchanged (could be expressions we don't parse)
+        seconds_value = _convert_tick_value(raw_value, config.tick_rate)
+        if seconds_value is not None:
+            element.set(attribute_name, seconds_value)
 
 
 def determine_output_path(input_path: Path, explicit_output: str | None) -> Path:
@@ -165,39 +216,49 @@ def determine_base_output_path(zht_secs_path: Path) -> Path:
 def process_file(input_file: Path, output_file: Path) -> None:
     register_namespaces()
 
-    tree = ET.parse(input_file)
-    root = tree.getroot()
+    # Single pass: timings are converted on each element's start event while the
+    # tree is built, instead of parsing first and walking the whole tree afterwards
+    if _HAS_LXML:
+        context = ET.iterparse(str(input_file), events=("start",), collect_ids=False, huge_tree=True)
+    else:
+        context = ET.iterparse(str(input_file), events=("start",))
+    config = None
+    for _event, elem in context:
+        if config is None:
+            # Read tickRate from the root attribute ttp:tickRate
+            tick_rate_text = elem.attrib.get(TICK_RATE_ATTR)
+            if tick_rate_text is None:
+                raise ValueError("Document does not define ttp:tickRate; cannot convert ticks")
 
-    # Read tickRate from the root attribute ttp:tickRate
-    tick_rate_attr_name = f"{{{NS_TTP}}}tickRate"
-    tick_rate_text = root.attrib.get(tick_rate_attr_name)
-    if tick_rate_text is None:
-        raise ValueError("Document does not define ttp:tickRate; cannot convert ticks")
+            try:
+                tick_rate = int(tick_rate_text)
+            except ValueError as exc:
+                raise ValueError(f"Invalid ttp:tickRate value: {tick_rate_text}") from exc
 
-    try:
-        tick_rate = int(tick_rate_text)
-    except ValueError as exc:
-        raise ValueError(f"Invalid ttp:tickRate value: {tick_rate_text}") from exc
+            config = TimingConversionConfig(tick_rate=tick_rate)
 
-    config = TimingConversionConfig(tick_rate=tick_rate)
+        # Most elements carry no timing at all: skip the call for them
+        attrib = elem.attrib
+        if "begin" in attrib or "end" in attrib:
+            convert_timing_attributes(elem, config)
 
-    # Iterate through all elements, converting timing attributes when applicable
-    for elem in root.iter():
-        convert_timing_attributes(elem, config)
+    tree = ET.ElementTree(context.root)
 
     # Write output preserving XML declaration and UTF-8 encoding
     tree.write(output_file, encoding="utf-8", xml_declaration=True)
 
 
-def process_srt_file(input_file: Path, output_file: Path) -> None:
-    """Convert an SRT file to XML format with seconds timing."""
-    srt_to_xml_seconds(input_file, output_file)
+def process_srt_file(input_file: Path, output_file: Path) -> ET.ElementTree:
+    """Convert an SRT file to XML format with seconds timing; returns the written tree."""
+    return srt_to_xml_seconds(input_file, output_file)
 
 
 def _iter_p_elements(root: ET.Element):
-    """Yield TTML <p> elements regardless of namespace prefix usage."""
-    p_tag = f"{{{NS_TTML}}}p"
-    yield from root.iter(p_tag)
+    """Iterate over the TTML <p> descendants regardless of namespace prefix usage."""
+    # lxml answers the descendant path faster than a filtered iter(); stdlib is the opposite
+    if _HAS_LXML:
+        return root.iterfind(_P_DESCENDANT_PATH)
+    return root.iter(TTML_P_TAG)
 
 
 def _extract_text_content(element: ET.Element) -> str:
@@ -205,16 +266,26 @@ def _extract_text_content(element: ET.Element) -> str:
 
     Collapses internal whitespace similarly to typical subtitle rendering.
     """
-    raw_text = "".join(element.itertext())
+    if _HAS_LXML:
+        # Serialized in C by libxml2; like itertext(), skips comments and the element's tail
+        raw_text = ET.tostring(element, method="text", encoding="unicode", with_tail=False)
+    else:
+        raw_text = "".join(element.itertext())
     # Normalize whitespace: strip ends and collapse internal runs
     normalized = " ".join(raw_text.split())
     return normalized
 
 
-def _parse_seconds_value(seconds_text: str) -> Decimal:
-    """Parse a TTML seconds string like '12.345s' into Decimal seconds."""
+def _parse_ms(seconds_text: str) -> int:
+    """Parse a TTML seconds string like '12.345s' into integer milliseconds."""
     value = seconds_text.strip().rstrip("s").strip()
-    return Decimal(value)
+    whole, _, frac = value.partition(".")
+    return int(whole or "0") * 1000 + int((frac + "000")[:3])
+
+
+def _format_ms(total_ms: int) -> str:
+    """Format integer milliseconds as a TTML seconds string like '12.345s'."""
+    return f"{total_ms // 1000}.{total_ms % 1000:03d}s"
 
 
 @dataclass
@@ -231,9 +302,8 @@ def parse_srt_timestamp(timestamp: str) -> Decimal:
     # Format: HH:MM:SS,mmm
     time_part, milliseconds = timestamp.split(',')
     hours, minutes, seconds = map(int, time_part.split(':'))
-    total_seconds = hours * 3600 + minutes * 60 + seconds
-    total_seconds += int(milliseconds) / 1000.0
-    return Decimal(str(total_seconds))
+    total_ms = (hours * 3600 + minutes * 60 + seconds) * 1000 + int(milliseconds)
+    return Decimal(total_ms).scaleb(-3)
 
 
 def parse_srt_file(srt_path: Path) -> list[SRTEntry]:
@@ -273,22 +343,29 @@ def parse_srt_file(srt_path: Path) -> list[SRTEntry]:
     return entries
 
 
-def srt_to_xml_seconds(srt_path: Path, output_path: Path) -> None:
-    """Convert an SRT file to XML format with seconds timing."""
+def srt_to_xml_seconds(srt_path: Path, output_path: Path) -> ET.ElementTree:
+    """Convert an SRT file to XML format with seconds timing.
+
+    Tags are created in the TTML namespace, so the returned tree can be used
+    directly (e.g. by _iter_p_elements) instead of parsing output_path again.
+    """
     entries = parse_srt_file(srt_path)
     
     # Create XML structure similar to TTML
-    root = ET.Element("tt", xmlns=NS_TTML)
+    if _HAS_LXML:
+        root = ET.Element(f"{{{NS_TTML}}}tt", nsmap={None: NS_TTML})
+    else:
+        root = ET.Element(f"{{{NS_TTML}}}tt")
     
     # Add head element
-    head = ET.SubElement(root, "head")
+    head = ET.SubElement(root, f"{{{NS_TTML}}}head")
     
     # Add body element
-    body = ET.SubElement(root, "body")
-    div = ET.SubElement(body, "div")
+    body = ET.SubElement(root, f"{{{NS_TTML}}}body")
+    div = ET.SubElement(body, f"{{{NS_TTML}}}div")
     
     for entry in entries:
-        p = ET.SubElement(div, "p")
+        p = ET.SubElement(div, TTML_P_TAG)
         # Convert timestamps to seconds format
         p.set("begin", f"{entry.start_time:.3f}s")
         p.set("end", f"{entry.end_time:.3f}s")
@@ -297,33 +374,71 @@ def srt_to_xml_seconds(srt_path: Path, output_path: Path) -> None:
     # Write to file
     tree = ET.ElementTree(root)
     tree.write(output_path, encoding="utf-8", xml_declaration=True)
+    return tree
 
 
-def _load_pt_entries(pt_secs_path: Path) -> list[tuple[Decimal, Decimal, str]]:
-    """Load PT/ES entries as a list of (begin_sec, end_sec, text)."""
-    tree = ET.parse(pt_secs_path)
-    root = tree.getroot()
-    entries: list[tuple[Decimal, Decimal, str]] = []
-    for p in _iter_p_elements(root):
+def _iter_p_streaming(xml_path: Path):
+    """Yield the TTML <p> elements of a file as they are parsed, clearing each one afterwards.
+
+    Only the element being yielded is kept in memory, so the caller must not hold on to it.
+    """
+    if _HAS_LXML:
+        context = ET.iterparse(str(xml_path), events=("end",), tag=TTML_P_TAG, collect_ids=False, huge_tree=True)
+        for _event, elem in context:
+            yield elem
+            elem.clear()
+            # Drop the already processed siblings still referenced by the parent
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    else:
+        for _event, elem in ET.iterparse(str(xml_path), events=("end",)):
+            if elem.tag == TTML_P_TAG:
+                yield elem
+                elem.clear()
+
+
+def _load_pt_entries(pt_secs_path: Path, tree: ET.ElementTree | None = None) -> list[tuple[int, int, str]]:
+    """Load PT/ES entries as a list of (begin_ms, end_ms, text).
+
+    Reuses tree if given; otherwise the file is streamed instead of parsed into a full tree.
+    """
+    p_elements = _iter_p_elements(tree.getroot()) if tree is not None else _iter_p_streaming(pt_secs_path)
+    entries: list[tuple[int, int, str]] = []
+    for p in p_elements:
         begin_text = p.get("begin") or "0s"
         end_text = p.get("end") or begin_text
         try:
-            begin_sec = _parse_seconds_value(begin_text)
-            end_sec = _parse_seconds_value(end_text)
+            begin_ms = _parse_ms(begin_text)
+            end_ms = _parse_ms(end_text)
         except Exception:
             # Skip unparsable entries
             continue
         text_content = _extract_text_content(p)
-        entries.append((begin_sec, end_sec, text_content))
+        entries.append((begin_ms, end_ms, text_content))
     # Keep entries sorted by begin time
     entries.sort(key=lambda e: e[0])
     return entries
 
 
+# Redraw the progress line at most every 50 ms; the final update is always shown
+_PROGRESS_MIN_INTERVAL_SEC = 0.05
+_last_progress_ts = 0.0
+
+
 def _print_progress(current: int, total: int, prefix: str = "") -> None:
     """Render a simple progress bar to stderr. Falls back to sparse counters if not a TTY."""
+    global _last_progress_ts
     if total <= 0:
         return
+
+    if current < total:
+        now = time.monotonic()
+        if now - _last_progress_ts < _PROGRESS_MIN_INTERVAL_SEC:
+            return
+        _last_progress_ts = now
+    else:
+        # Let the next progress bar start drawing immediately
+        _last_progress_ts = 0.0
     
     # Simple text-only progress without fancy characters
     percent = int((current / total) * 100)
@@ -342,9 +457,63 @@ def _sanitize_tsv_field(text: str) -> str:
     """Replace tabs/newlines and collapse internal whitespace to keep TSV integrity."""
     if text is None:
         return ""
-    cleaned = text.replace("\t", " ")
-    cleaned = " ".join(cleaned.split())
-    return cleaned
+    # str.split() already breaks on tabs/newlines (and full-width spaces) in C
+    return " ".join(text.split())
+
+
+# Persistent cache of LLM pair extractions, shared across runs and directories
+PAIRS_CACHE_PATH = Path(__file__).resolve().parent / ".llm_pairs_cache.json"
+# "N/A" and answers that are not a JSON list of strings are usually transient,
+# so they are only trusted for a short while
+PAIRS_CACHE_FALLBACK_TTL_SEC = 3600.0
+
+
+def _pairs_cache_key(provider: str, zht_text: str) -> str:
+    """Hash the model name and zht text so a model switch never reuses stale pairs."""
+    if provider == "maritaca":
+        model = os.getenv("MARITACA_MODEL", "sabiazinho-3")
+    else:
+        model = os.getenv("DEEPSEEK_MODEL", "deepseek-chat")
+    return hashlib.sha256(f"{model}\n{zht_text}".encode("utf-8")).hexdigest()
+
+
+def _is_pairs_list(pairs_str: str) -> bool:
+    """Return True if pairs_str is a JSON list of strings, i.e. a well-formed LLM answer."""
+    try:
+        pairs = json.loads(pairs_str)
+    except (TypeError, ValueError):
+        return False
+    return isinstance(pairs, list) and all(isinstance(x, str) for x in pairs)
+
+
+def _load_pairs_cache() -> dict[str, list]:
+    """Load the {key: [timestamp, pairs]} cache, dropping expired fallback entries.
+
+    Well-formed answers are kept indefinitely; "N/A" and unparsed answers expire
+    after PAIRS_CACHE_FALLBACK_TTL_SEC.
+    """
+    try:
+        data = json.loads(PAIRS_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    now = time.time()
+    return {
+        key: entry for key, entry in data.items()
+        if isinstance(entry, list) and len(entry) == 2
+        and (now - entry[0] < PAIRS_CACHE_FALLBACK_TTL_SEC or _is_pairs_list(entry[1]))
+    }
+
+
+def _save_pairs_cache(cache: dict[str, list]) -> None:
+    """Write the pairs cache atomically; failures only cost a future re-query."""
+    tmp_path = PAIRS_CACHE_PATH.with_suffix(".tmp")
+    try:
+        tmp_path.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, PAIRS_CACHE_PATH)
+    except OSError as e:
+        print(f"Aviso: não foi possível salvar o cache de pares: {e}", file=sys.stderr)
 
 
 def _get_api_provider(force_provider: str | None = None) -> str:
@@ -436,6 +605,95 @@ def _retry_api_call(func, *args, max_retries: int = 3, base_delay: float = 2.0,
     raise last_exception
 
 
+# Keep-alive connections, one per (thread, host), reused across LLM calls
+_http_local = threading.local()
+
+
+def _post_json(url: str, body: dict | bytes, api_key: str, timeout_sec: float) -> str:
+    """POST a JSON body (dict, or already encoded bytes) with a Bearer key over a reused keep-alive connection.
+
+    Returns the response body as text. HTTP error statuses raise urllib's HTTPError and
+    protocol failures raise URLError, mirroring urlopen so callers keep their handling.
+    """
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+    headers = {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}
+
+    # Proxied setups keep going through urlopen, which honours the *_proxy variables
+    if urlrequest.getproxies().get(parts.scheme):
+        req = urlrequest.Request(url, data=data, headers=headers, method="POST")
+        with urlrequest.urlopen(req, timeout=timeout_sec) as resp:
+            return resp.read().decode("utf-8", errors="replace")
+
+    connections = getattr(_http_local, "connections", None)
+    if connections is None:
+        connections = _http_local.connections = {}
+    key = (parts.scheme, parts.netloc)
+
+    while True:
+        conn = connections.get(key)
+        reused = conn is not None
+        if conn is None:
+            conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            conn = connections[key] = conn_cls(parts.netloc, timeout=timeout_sec)
+        conn.timeout = timeout_sec
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout_sec)
+        try:
+            conn.request("POST", path, body=data, headers=headers)
+            resp = conn.getresponse()
+            payload = resp.read()
+        except (http.client.HTTPException, OSError) as exc:
+            conn.close()
+            del connections[key]
+            # The server may drop an idle keep-alive connection: retry once on a fresh one
+            if reused and isinstance(exc, (http.client.HTTPException, ConnectionError)):
+                continue
+            if isinstance(exc, http.client.HTTPException):
+                raise urlerror.URLError(exc) from exc
+            raise
+        if resp.status >= 400:
+            raise urlerror.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+        return payload.decode("utf-8", errors="replace")
+
+
+PAIRS_PROMPT_PREFIX = (
+    "Você é um extrator. Dada a frase em chinês tradicional (zht), responda EXTRAINDO "
+    "apenas as palavras da própria frase com suas traduções para pt-BR.\n"
+    "RETORNE SOMENTE uma lista JSON de strings no formato \"palavra (pinyin): tradução\";\n"
+    "sem explicações, sem texto extra, sem rótulos, sem markdown.\n"
+    "Exemplo de formato: [\"三 (sān): três\", \"號 (hào): número\", \"碼頭 (mǎ tóu): cais\"].\n"
+    "Não invente palavras fora da frase.\n\n"
+    "Frase: "
+)
+
+
+@lru_cache(maxsize=8)
+def _pairs_body_template(model: str, max_tokens: int | None) -> tuple[bytes, bytes]:
+    """Encode the constant pairs request once, split around where the sentence goes."""
+    marker = "\x00ZHT\x00"
+    body = {
+        "model": model,
+        "messages": [
+            {"role": "user", "content": PAIRS_PROMPT_PREFIX + marker},
+        ],
+        "temperature": 0.2,
+    }
+    if max_tokens is not None:
+        body["max_tokens"] = max_tokens
+    head, tail = json.dumps(body).split(json.dumps(marker)[1:-1])
+    return head.encode("utf-8"), tail.encode("utf-8")
+
+
+def _pairs_request_body(zht_text: str, model: str, max_tokens: int | None = None) -> bytes:
+    """JSON request body for a pairs extraction; only the sentence is encoded per call."""
+    head, tail = _pairs_body_template(model, max_tokens)
+    return head + json.dumps(zht_text)[1:-1].encode("utf-8") + tail
+
+
 def _call_maritaca_pairs(zht_text: str, timeout_sec: float = 15.0) -> str:
     """Call Maritaca AI API to extract list ["palavra: tradução", ...] for zht_text.
 
@@ -453,54 +711,31 @@ def _call_maritaca_pairs(zht_text: str, timeout_sec: float = 15.0) -> str:
     model = os.getenv("MARITACA_MODEL", "sabiazinho-3")
     url = "https://chat.maritaca.ai/api/chat/completions"
 
-    prompt = (
-        "Você é um extrator. Dada a frase em chinês tradicional (zht), responda EXTRAINDO "
-        "apenas as palavras da própria frase com suas traduções para pt-BR.\n"
-        "RETORNE SOMENTE uma lista JSON de strings no formato \"palavra (pinyin): tradução\";\n"
-        "sem explicações, sem texto extra, sem rótulos, sem markdown.\n"
-        "Exemplo de formato: [\"三 (sān): três\", \"號 (hào): número\", \"碼頭 (mǎ tóu): cais\"].\n"
-        "Não invente palavras fora da frase.\n\n"
-        f"Frase: {zht_text}"
-    )
-
-    body = {
-        "model": model,
-        "messages": [
-            {"role": "user", "content": prompt},
-        ],
-        "temperature": 0.2,
-        "max_tokens": 8000
-    }
-    data = json.dumps(body).encode("utf-8")
-
-    req = urlrequest.Request(url, data=data, method="POST")
-    req.add_header("Content-Type", "application/json")
-    req.add_header("Authorization", f"Bearer {api_key}")
+    body = _pairs_request_body(zht_text, model, 8000)
 
     try:
-        with urlrequest.urlopen(req, timeout=timeout_sec) as resp:
-            resp_data = resp.read().decode("utf-8", errors="replace")
-            obj = json.loads(resp_data)
-            content = obj.get("choices", [{}])[0].get("message", {}).get("content")
-            if not content:
-                return "N/A"
-            
-            # Clean markdown formatting if present
-            cleaned_content = content.strip()
-            if cleaned_content.startswith("```json") and cleaned_content.endswith("```"):
-                cleaned_content = cleaned_content[7:-3].strip()
-            elif cleaned_content.startswith("```") and cleaned_content.endswith("```"):
-                cleaned_content = cleaned_content[3:-3].strip()
-            
-            # Try to strictly keep only a JSON array of strings
-            try:
-                parsed = json.loads(cleaned_content)
-                if isinstance(parsed, list) and all(isinstance(x, str) for x in parsed):
-                    return json.dumps(parsed, ensure_ascii=False)
-            except Exception:
-                pass
-            # Fallback: sanitize raw content
-            return _sanitize_tsv_field(cleaned_content)
+        resp_data = _post_json(url, body, api_key, timeout_sec)
+        obj = json.loads(resp_data)
+        content = obj.get("choices", [{}])[0].get("message", {}).get("content")
+        if not content:
+            return "N/A"
+        
+        # Clean markdown formatting if present
+        cleaned_content = content.strip()
+        if cleaned_content.startswith("```json") and cleaned_content.endswith("```"):
+            cleaned_content = cleaned_content[7:-3].strip()
+        elif cleaned_content.startswith("```") and cleaned_content.endswith("```"):
+            cleaned_content = cleaned_content[3:-3].strip()
+        
+        # Try to strictly keep only a JSON array of strings
+        try:
+            parsed = json.loads(cleaned_content)
+            if isinstance(parsed, list) and all(isinstance(x, str) for x in parsed):
+                return json.dumps(parsed, ensure_ascii=False)
+        except Exception:
+            pass
+        # Fallback: sanitize raw content
+        return _sanitize_tsv_field(cleaned_content)
     except (urlerror.URLError, urlerror.HTTPError, TimeoutError, ValueError, KeyError, OSError) as exc:
         # Enhanced error handling with more specific messages for pairs extraction
         if isinstance(exc, urlerror.HTTPError):
@@ -538,14 +773,83 @@ def _call_deepseek_pairs(zht_text: str, timeout_sec: float = 15.0) -> str:
     model = os.getenv("DEEPSEEK_MODEL", "deepseek-chat")
     url = f"{api_base.rstrip('/')}/chat/completions"
 
+    body = _pairs_request_body(zht_text, model)
+
+    try:
+        resp_data = _post_json(url, body, api_key, timeout_sec)
+        obj = json.loads(resp_data)
+        content = obj.get("choices", [{}])[0].get("message", {}).get("content")
+        if not content:
+            return "N/A"
+        # Try to strictly keep only a JSON array of strings
+        try:
+            parsed = json.loads(content)
+            if isinstance(parsed, list) and all(isinstance(x, str) for x in parsed):
+                return json.dumps(parsed, ensure_ascii=False)
+        except Exception:
+            pass
+        # Fallback: sanitize raw content
+        return _sanitize_tsv_field(content)
+    except (urlerror.URLError, urlerror.HTTPError, TimeoutError, ValueError, KeyError, OSError) as exc:
+        # Enhanced error handling with more specific messages for pairs extraction
+        if isinstance(exc, urlerror.HTTPError):
+            if exc.code == 401:
+                raise RuntimeError("Erro de autenticação com DeepSeek API. Verifique sua API key.")
+            elif exc.code == 429:
+                raise RuntimeError("Limite de taxa da API DeepSeek excedido. Aguarde alguns minutos.")
+            elif exc.code >= 500:
+                raise RuntimeError(f"Erro no servidor DeepSeek (HTTP {exc.code}). Tente novamente mais tarde.")
+        elif isinstance(exc, TimeoutError):
+            raise RuntimeError(f"Timeout na extração de pares DeepSeek API ({timeout_sec}s). Possível problema de rede ou servidor sobrecarregado.")
+        elif isinstance(exc, OSError) and getattr(exc, 'errno', None) == 53:
+            raise RuntimeError("Conexão abortada na extração de pares DeepSeek API (Errno 53). Servidor pode ter fechado a conexão.")
+        elif "connection abort" in str(exc).lower() or "software caused connection abort" in str(exc).lower():
+            raise RuntimeError("Conexão abortada na extração de pares DeepSeek API. Possível problema de rede ou servidor indisponível.")
+        else:
+            raise RuntimeError(f"Falha ao extrair pares via DeepSeek: {exc}")
+
+
+def _pairs_belong_to(pairs: list, zht_text: str) -> bool:
+    """Check that every "palavra (pinyin): tradução" item names a word of zht_text.
+
+    Batch answers are matched to sentences by position, so an answer that skipped or
+    split a sentence would otherwise be stored under the wrong one.
+    """
+    if not pairs:
+        return False
+    for pair in pairs:
+        if not isinstance(pair, str):
+            return False
+        head = pair.split(" (", 1)[0].strip()
+        if not head or head not in zht_text:
+            return False
+    return True
+
+
+def _call_deepseek_pairs_batch(zht_texts: list[str], timeout_sec: float = 60.0) -> dict[str, str]:
+    """Call DeepSeek once to extract pairs for several zht sentences.
+
+    Same configuration as _call_deepseek_pairs. Returns {zht_text: pairs_json} for
+    the sentences whose answer came back as a list of strings naming words of that
+    sentence; sentences missing from the result should be retried individually.
+    """
+    api_key = os.getenv("DEEPSEEK_API_KEY")
+    if not api_key or api_key.strip() == "":
+        raise RuntimeError("DEEPSEEK_API_KEY não encontrada ou vazia no ambiente")
+
+    api_base = os.getenv("DEEPSEEK_API_BASE", "https://api.deepseek.com")
+    model = os.getenv("DEEPSEEK_MODEL", "deepseek-chat")
+    url = f"{api_base.rstrip('/')}/chat/completions"
+
     prompt = (
-        "Você é um extrator. Dada a frase em chinês tradicional (zht), responda EXTRAINDO "
-        "apenas as palavras da própria frase com suas traduções para pt-BR.\n"
-        "RETORNE SOMENTE uma lista JSON de strings no formato \"palavra (pinyin): tradução\";\n"
+        "Você é um extrator. Para cada frase em chinês tradicional (zht) da lista JSON abaixo, "
+        "EXTRAIA apenas as palavras da própria frase com suas traduções para pt-BR.\n"
+        "RETORNE SOMENTE um array JSON com uma lista por frase, na mesma ordem e com o mesmo "
+        "número de itens da entrada; cada lista contém strings no formato \"palavra (pinyin): tradução\";\n"
         "sem explicações, sem texto extra, sem rótulos, sem markdown.\n"
-        "Exemplo de formato: [\"三 (sān): três\", \"號 (hào): número\", \"碼頭 (mǎ tóu): cais\"].\n"
-        "Não invente palavras fora da frase.\n\n"
-        f"Frase: {zht_text}"
+        "Exemplo para 2 frases: [[\"三 (sān): três\", \"號 (hào): número\"], [\"碼頭 (mǎ tóu): cais\"]].\n"
+        "Não invente palavras fora das frases.\n\n"
+        f"Frases: {json.dumps(zht_texts, ensure_ascii=False)}"
     )
 
     body = {
@@ -554,31 +858,14 @@ def _call_deepseek_pairs(zht_text: str, timeout_sec: float = 15.0) -> str:
             {"role": "user", "content": prompt},
         ],
         "temperature": 0.2,
+        "max_tokens": 8000,
     }
-    data = json.dumps(body).encode("utf-8")
-
-    req = urlrequest.Request(url, data=data, method="POST")
-    req.add_header("Content-Type", "application/json")
-    req.add_header("Authorization", f"Bearer {api_key}")
 
     try:
-        with urlrequest.urlopen(req, timeout=timeout_sec) as resp:
-            resp_data = resp.read().decode("utf-8", errors="replace")
-            obj = json.loads(resp_data)
-            content = obj.get("choices", [{}])[0].get("message", {}).get("content")
-            if not content:
-                return "N/A"
-            # Try to strictly keep only a JSON array of strings
-            try:
-                parsed = json.loads(content)
-                if isinstance(parsed, list) and all(isinstance(x, str) for x in parsed):
-                    return json.dumps(parsed, ensure_ascii=False)
-            except Exception:
-                pass
-            # Fallback: sanitize raw content
-            return _sanitize_tsv_field(content)
+        resp_data = _post_json(url, body, api_key, timeout_sec)
+        obj = json.loads(resp_data)
+        content = obj.get("choices", [{}])[0].get("message", {}).get("content") or ""
     except (urlerror.URLError, urlerror.HTTPError, TimeoutError, ValueError, KeyError, OSError) as exc:
-        # Enhanced error handling with more specific messages for pairs extraction
         if isinstance(exc, urlerror.HTTPError):
             if exc.code == 401:
                 raise RuntimeError("Erro de autenticação com DeepSeek API. Verifique sua API key.")
@@ -587,13 +874,25 @@ def _call_deepseek_pairs(zht_text: str, timeout_sec: float = 15.0) -> str:
             elif exc.code >= 500:
                 raise RuntimeError(f"Erro no servidor DeepSeek (HTTP {exc.code}). Tente novamente mais tarde.")
         elif isinstance(exc, TimeoutError):
-            raise RuntimeError(f"Timeout na extração de pares DeepSeek API ({timeout_sec}s). Possível problema de rede ou servidor sobrecarregado.")
-        elif isinstance(exc, OSError) and getattr(exc, 'errno', None) == 53:
-            raise RuntimeError("Conexão abortada na extração de pares DeepSeek API (Errno 53). Servidor pode ter fechado a conexão.")
-        elif "connection abort" in str(exc).lower() or "software caused connection abort" in str(exc).lower():
-            raise RuntimeError("Conexão abortada na extração de pares DeepSeek API. Possível problema de rede ou servidor indisponível.")
-        else:
-            raise RuntimeError(f"Falha ao extrair pares via DeepSeek: {exc}")
+            raise RuntimeError(f"Timeout na extração de pares em lote DeepSeek API ({timeout_sec}s).")
+        raise RuntimeError(f"Falha ao extrair pares em lote via DeepSeek: {exc}")
+
+    # Tolerate a markdown fence around the array; anything unparsable falls back per sentence
+    content = content.strip()
+    if content.startswith("```"):
+        content = content.strip("`").removeprefix("json").strip()
+    try:
+        parsed = json.loads(content)
+    except ValueError:
+        return {}
+    if not isinstance(parsed, list) or len(parsed) != len(zht_texts):
+        return {}
+
+    results: dict[str, str] = {}
+    for zht_text, pairs in zip(zht_texts, parsed):
+        if isinstance(pairs, list) and _pairs_belong_to(pairs, zht_text):
+            results[zht_text] = json.dumps(pairs, ensure_ascii=False)
+    return results
 
 
 def _call_maritaca_translate_to_zht(text: str, source_lang: str, timeout_sec: float = 30.0) -> str:
@@ -632,20 +931,14 @@ def _call_maritaca_translate_to_zht(text: str, source_lang: str, timeout_sec: fl
         "temperature": 0.2,
         "max_tokens": 8000
     }
-    data = json.dumps(body).encode("utf-8")
-
-    req = urlrequest.Request(url, data=data, method="POST")
-    req.add_header("Content-Type", "application/json")
-    req.add_header("Authorization", f"Bearer {api_key}")
 
     try:
-        with urlrequest.urlopen(req, timeout=timeout_sec) as resp:
-            resp_data = resp.read().decode("utf-8", errors="replace")
-            obj = json.loads(resp_data)
-            content = obj.get("choices", [{}])[0].get("message", {}).get("content")
-            if not content:
-                raise RuntimeError("Maritaca AI retornou resposta vazia para tradução")
-            return content.strip()
+        resp_data = _post_json(url, body, api_key, timeout_sec)
+        obj = json.loads(resp_data)
+        content = obj.get("choices", [{}])[0].get("message", {}).get("content")
+        if not content:
+            raise RuntimeError("Maritaca AI retornou resposta vazia para tradução")
+        return content.strip()
     except (urlerror.URLError, urlerror.HTTPError, TimeoutError, ValueError, KeyError, OSError) as exc:
         # Enhanced error handling with more specific messages
         if isinstance(exc, urlerror.HTTPError):
@@ -700,20 +993,14 @@ def _call_deepseek_translate_to_zht(text: str, source_lang: str, timeout_sec: fl
         ],
         "temperature": 0.2,
     }
-    data = json.dumps(body).encode("utf-8")
-
-    req = urlrequest.Request(url, data=data, method="POST")
-    req.add_header("Content-Type", "application/json")
-    req.add_header("Authorization", f"Bearer {api_key}")
 
     try:
-        with urlrequest.urlopen(req, timeout=timeout_sec) as resp:
-            resp_data = resp.read().decode("utf-8", errors="replace")
-            obj = json.loads(resp_data)
-            content = obj.get("choices", [{}])[0].get("message", {}).get("content")
-            if not content:
-                raise RuntimeError("DeepSeek retornou resposta vazia para tradução")
-            return content.strip()
+        resp_data = _post_json(url, body, api_key, timeout_sec)
+        obj = json.loads(resp_data)
+        content = obj.get("choices", [{}])[0].get("message", {}).get("content")
+        if not content:
+            raise RuntimeError("DeepSeek retornou resposta vazia para tradução")
+        return content.strip()
     except (urlerror.URLError, urlerror.HTTPError, TimeoutError, ValueError, KeyError, OSError) as exc:
         # Enhanced error handling with more specific messages
         if isinstance(exc, urlerror.HTTPError):
@@ -761,6 +1048,18 @@ def create_zht_secs_from_srt(source_srt: Path, source_lang: str) -> Path:
     return create_zht_secs_from_source(xml_output, source_lang, None)
 
 
+def _parent_lookup(root: ET.Element):
+    """Return a child -> parent function for nodes under root.
+
+    lxml keeps parent links (getparent); ElementTree does not, so a map is built
+    once instead of rescanning the tree for every removal.
+    """
+    if _HAS_LXML:
+        return lambda child: child.getparent()
+    parents = {child: parent for parent in root.iter() for child in parent}
+    return parents.get
+
+
 def create_zht_secs_from_source(source_secs: Path, source_lang: str, force_provider: str | None = None) -> Path:
     """Create a zht_secs XML by translating each <p> text from source_lang (pt or es).
 
@@ -771,30 +1070,29 @@ def create_zht_secs_from_source(source_secs: Path, source_lang: str, force_provi
     out_path = _determine_zht_secs_output_from(source_secs)
 
     # Load source (pt/es) as reference ordering and ids
-    src_tree = ET.parse(source_secs)
+    src_tree = _parse_xml(source_secs)
     src_root = src_tree.getroot()
 
     # Load or initialize destination tree (zht)
     if out_path.exists():
-        dest_tree = ET.parse(out_path)
+        dest_tree = _parse_xml(out_path)
         dest_root = dest_tree.getroot()
     else:
         # Start from a copy of the source structure and blank texts,
         # so the resume logic knows these lines still need translation.
-        dest_tree = ET.parse(source_secs)
+        dest_tree = _parse_xml(source_secs)
         dest_root = dest_tree.getroot()
         for dp in _iter_p_elements(dest_root):
             for child in list(dp):
                 dp.remove(child)
             dp.text = ""
 
-    # Helper to find a parent of a node (ElementTree doesn't keep parent refs)
-    def _find_parent(root: ET.Element, child: ET.Element) -> ET.Element | None:
-        for elem in root.iter():
-            for c in list(elem):
-                if c is child:
-                    return elem
-        return None
+    find_parent = _parent_lookup(dest_root)
+
+    # Index destination <p> nodes by 'begin' once, in document order
+    dest_by_begin: dict[str, list[ET.Element]] = {}
+    for dp in _iter_p_elements(dest_root):
+        dest_by_begin.setdefault(dp.get("begin", ""), []).append(dp)
 
     # Build groups of consecutive <p> that share the same 'begin' time (in seconds string)
     src_ps = list(_iter_p_elements(src_root))
@@ -813,20 +1111,20 @@ def create_zht_secs_from_source(source_secs: Path, source_lang: str, force_provi
     total = len(groups)
     for g_idx, group in enumerate(groups, start=1):
         # Compute merged original text and max end time
-        merged_text = " ".join(_extract_text_content(p) for p in group if _extract_text_content(p))
+        merged_text = " ".join(filter(None, map(_extract_text_content, group)))
         if not merged_text:
             _print_progress(g_idx, total, prefix="Gerando zht via LLM")
             continue
         # Determine combined end as max of group's end
         try:
-            max_end = max((_parse_seconds_value(p.get("end") or p.get("begin") or "0s") for p in group))
-            combined_end = f"{format(max_end, '.3f')}s"
+            max_end = max(_parse_ms(p.get("end") or p.get("begin") or "0s") for p in group)
+            combined_end = _format_ms(max_end)
         except Exception:
             combined_end = group[-1].get("end") or group[-1].get("begin") or "0s"
 
         # In destination tree, find all <p> with this begin
         begin_key = group[0].get("begin", "")
-        dest_candidates = [dp for dp in _iter_p_elements(dest_root) if dp.get("begin", "") == begin_key]
+        dest_candidates = dest_by_begin.get(begin_key)
         if not dest_candidates:
             _print_progress(g_idx, total, prefix="Gerando zht via LLM")
             continue
@@ -861,12 +1159,13 @@ def create_zht_secs_from_source(source_secs: Path, source_lang: str, force_provi
 
         # Keep only the first node for this begin; remove the rest
         for extra in dest_candidates[1:]:
-            parent = _find_parent(dest_root, extra)
+            parent = find_parent(extra)
             if parent is not None:
                 try:
                     parent.remove(extra)
                 except Exception:
                     pass
+        dest_by_begin[begin_key] = [dest_first]
 
         # Set translated text and combined end on the kept node
         for child in list(dest_first):
@@ -891,16 +1190,10 @@ def _merge_consecutive_same_begin(root: ET.Element) -> None:
     - Sets 'end' to the maximum end within the group
     - Removes the extra nodes, keeping only the first in each group
     """
-    def _find_parent(r: ET.Element, child: ET.Element) -> ET.Element | None:
-        for elem in r.iter():
-            for c in list(elem):
-                if c is child:
-                    return elem
-        return None
-
     p_nodes = list(_iter_p_elements(root))
     if not p_nodes:
         return
+    find_parent = _parent_lookup(root)
 
     # Build groups by consecutive equal 'begin'
     groups: list[list[ET.Element]] = []
@@ -920,18 +1213,11 @@ def _merge_consecutive_same_begin(root: ET.Element) -> None:
             continue
         first = group[0]
         # Merge texts
-        merged_text = " ".join(
-            _extract_text_content(g) for g in group if _extract_text_content(g)
-        ).strip()
+        merged_text = " ".join(filter(None, map(_extract_text_content, group))).strip()
         # Max end within group
         try:
-            max_end = max(
-                (
-                    _parse_seconds_value(g.get("end") or g.get("begin") or "0s")
-                    for g in group
-                )
-            )
-            first.set("end", f"{format(max_end, '.3f')}s")
+            max_end = max(_parse_ms(g.get("end") or g.get("begin") or "0s") for g in group)
+            first.set("end", _format_ms(max_end))
         except Exception:
             pass
 
@@ -942,7 +1228,7 @@ def _merge_consecutive_same_begin(root: ET.Element) -> None:
 
         # Remove the remaining nodes
         for extra in group[1:]:
-            parent = _find_parent(root, extra)
+            parent = find_parent(extra)
             if parent is not None:
                 try:
                     parent.remove(extra)
@@ -950,40 +1236,39 @@ def _merge_consecutive_same_begin(root: ET.Element) -> None:
                     pass
 
 
-def merge_same_begin_in_file(xml_path: Path) -> None:
-    """Parse XML at xml_path, merge consecutive same-begin <p> nodes, and write back."""
+def merge_same_begin_in_file(xml_path: Path, tree: ET.ElementTree | None = None) -> ET.ElementTree | None:
+    """Merge consecutive same-begin <p> nodes of xml_path and write back.
+
+    Uses tree instead of parsing xml_path when given. Returns the merged tree,
+    or None if the file could not be processed.
+    """
     try:
-        tree = ET.parse(xml_path)
+        if tree is None:
+            tree = _parse_xml(xml_path)
         root = tree.getroot()
         _merge_consecutive_same_begin(root)
         tree.write(xml_path, encoding="utf-8", xml_declaration=True)
+        return tree
     except Exception:
         # Silent no-op to avoid breaking main flow
-        pass
+        return None
+
 
+def convert_srt_to_merged_secs(srt_path: Path, xml_path: Path) -> ET.ElementTree | None:
+    """Convert an SRT to *_secs.xml and merge same-begin cues; returns the merged tree."""
+    return merge_same_begin_in_file(xml_path, process_srt_file(srt_path, xml_path))
 
-def generate_zht_base_file(zht_secs_path: Path, pt_secs_path: Path, resume_from_seconds: float | None = None, force_provider: str | None = None) -> Path:
+
+def generate_zht_base_file(zht_secs_path: Path, pt_secs_path: Path, resume_from_seconds: float | None = None, force_provider: str | None = None, zht_tree: ET.ElementTree | None = None, pt_tree: ET.ElementTree | None = None) -> Path:
     """Create a TSV file with: index, begin, end, zht text, pairs, pt text.
 
     PT matched by time within ZHT window; pairs fetched via DeepSeek if configured.
+    zht_tree/pt_tree, when given, are the already parsed secs files.
     """
-    tree = ET.parse(zht_secs_path)
+    tree = zht_tree if zht_tree is not None else _parse_xml(zht_secs_path)
     root = tree.getroot()
 
     index_counter = 1
-    pt_entries = _load_pt_entries(pt_secs_path)
-    pairs_cache: dict[str, str] = {}
-
-    def match_pt_text(zht_begin: Decimal, zht_end: Decimal) -> str:
-        # Prefer PT whose begin falls within the ZHT interval
-        for begin_pt, end_pt, text_pt in pt_entries:
-            if begin_pt >= zht_begin and begin_pt <= zht_end:
-                return text_pt
-        # Otherwise take any overlapping interval
-        for begin_pt, end_pt, text_pt in pt_entries:
-            if (end_pt >= zht_begin) and (begin_pt <= zht_end):
-                return text_pt
-        return "N/A"
 
     p_nodes = list(_iter_p_elements(root))
     total_nodes = len(p_nodes)
@@ -1050,75 +1335,165 @@ def generate_zht_base_file(zht_secs_path: Path, pt_secs_path: Path, resume_from_
         except Exception as e:
             print(f"Aviso: Erro ao ler arquivo base existente: {e}. Iniciando do zero.")
             pass
+
+    # Pairs already written to the preserved lines are reused for repeated sentences
+    resumed_pairs: dict[str, str] = {}
+    for line in existing_lines:
+        parts = line.split('\t')
+        if len(parts) >= 5 and parts[4] != "N/A":
+            resumed_pairs.setdefault(parts[3], parts[4])
     
-    # Open file for writing (either fresh or append mode)
-    with base_out_path.open(file_mode, encoding="utf-8") as output_file:
-        for idx, p in enumerate(p_nodes, start=1):
-            begin_time = p.get("begin", "")
-            end_time = p.get("end") or begin_time or ""
-            text_content = _extract_text_content(p)
-            # Skip empty lines (no text and no begin)
-            if not begin_time and not text_content:
+    def abort_on_llm_error(e: Exception, zht_text: str) -> None:
+        print(f"\n❌ Erro fatal na extração de pares via LLM:", file=sys.stderr)
+        print(f"   Tipo do erro: {type(e).__name__}", file=sys.stderr)
+        print(f"   Mensagem: {e}", file=sys.stderr)
+        print(f"   Texto para extrair pares: {zht_text[:100]}...", file=sys.stderr)
+        print(f"🛑 Interrompendo processamento do diretório devido ao erro na LLM", file=sys.stderr)
+        # Remove any partial base file to avoid corrupted data
+        if base_out_path.exists():
+            base_out_path.unlink()
+            print(f"🗑️  Arquivo base parcial removido: {base_out_path}", file=sys.stderr)
+        raise SystemExit(1)
+
+    # First pass: collect the entries still to be written (idx, begin, end, zht, begin_ms, end_ms)
+    pending_rows: list[tuple[int, str, str, str, int, int]] = []
+    for idx, p in enumerate(p_nodes, start=1):
+        begin_time = p.get("begin", "")
+        end_time = p.get("end") or begin_time or ""
+        text_content = _extract_text_content(p)
+        # Skip empty lines (no text and no begin)
+        if not begin_time and not text_content:
+            continue
+
+        # Skip if resume mode and timestamp is before resume point or already processed
+        if auto_resume_from_seconds is not None:
+            if begin_time in processed_timestamps:
                 continue
-                
-            # Skip if resume mode and timestamp is before resume point or already processed
-            if auto_resume_from_seconds is not None:
-                if begin_time in processed_timestamps:
-                    continue
-                try:
-                    current_timestamp = float(begin_time.rstrip('s'))
-                    if current_timestamp <= auto_resume_from_seconds:
-                        continue
-                except (ValueError, AttributeError):
-                    pass
-            
-            # Determine PT translation match
             try:
-                z_begin = _parse_seconds_value(begin_time or "0s")
-                z_end = _parse_seconds_value(end_time or begin_time or "0s")
-            except Exception:
-                z_begin = Decimal(0)
-                z_end = z_begin
-            pt_text = match_pt_text(z_begin, z_end)
-            
-            # Fetch pairs for zht text (with simple cache)
-            zht_norm = text_content
-            if zht_norm in pairs_cache:
-                pairs_str = pairs_cache[zht_norm]
-            else:
-                # Choose API provider based on environment variables or forced selection
-                provider = _get_api_provider(force_provider)
-                try:
-                    if provider == "maritaca":
-                        pairs_str = _retry_api_call(_call_maritaca_pairs, zht_norm)
-                    else:
-                        pairs_str = _retry_api_call(_call_deepseek_pairs, zht_norm)
-                    pairs_cache[zht_norm] = pairs_str
-                except Exception as e:
-                    print(f"\n❌ Erro fatal na extração de pares via LLM:", file=sys.stderr)
-                    print(f"   Tipo do erro: {type(e).__name__}", file=sys.stderr)
-                    print(f"   Mensagem: {e}", file=sys.stderr)
-                    print(f"   Texto para extrair pares: {zht_norm[:100]}...", file=sys.stderr)
-                    print(f"🛑 Interrompendo processamento do diretório devido ao erro na LLM", file=sys.stderr)
-                    # Remove any partial base file to avoid corrupted data
-                    if base_out_path.exists():
-                        base_out_path.unlink()
-                        print(f"🗑️  Arquivo base parcial removido: {base_out_path}", file=sys.stderr)
-                    raise SystemExit(1)
-            
-            # Use tab-separated fields for safety; insert end time after begin time
-            line = (
-                f"{index_counter}\t{_sanitize_tsv_field(begin_time)}\t{_sanitize_tsv_field(end_time)}\t"
-                f"{_sanitize_tsv_field(text_content)}\t{_sanitize_tsv_field(pairs_str)}\t"
-                f"{_sanitize_tsv_field(pt_text)}"
-            )
-            
-            # Write line immediately to file
-            output_file.write(line + "\n")
-            output_file.flush()  # Ensure it's written to disk immediately
-            
-            index_counter += 1
-            _print_progress(idx, total_nodes, prefix="Gerando base/LLM")
+                current_timestamp = float(begin_time.rstrip('s'))
+                if current_timestamp <= auto_resume_from_seconds:
+                    continue
+            except (ValueError, AttributeError):
+                pass
+
+        # Window used later to match the PT translation
+        try:
+            z_begin = _parse_ms(begin_time or "0s")
+            z_end = _parse_ms(end_time or begin_time or "0s")
+        except Exception:
+            z_begin = 0
+            z_end = z_begin
+        pending_rows.append((idx, begin_time, end_time, text_content, z_begin, z_end))
+
+    if not pending_rows:
+        base_out_path.open(file_mode, encoding="utf-8").close()
+        return base_out_path
+
+    # Choose API provider based on environment variables or forced selection.
+    # A configuration error propagates to the caller and keeps the resumable base file.
+    provider = _get_api_provider(force_provider)
+    pairs_func = _call_maritaca_pairs if provider == "maritaca" else _call_deepseek_pairs
+
+    # Pairs already extracted in earlier runs are reused from the on-disk cache
+    disk_cache = _load_pairs_cache()
+    cache_keys: dict[str, str] = {}
+    pairs_cache: dict[str, str] = {}
+    unsaved_entries = 0
+
+    # DeepSeek answers several sentences per request; Maritaca stays one sentence per call
+    batch_size = max(1, int(os.getenv("DEEPSEEK_BATCH", "20"))) if provider == "deepseek" else 1
+
+    def fetch_pairs(zht_texts: list[str]) -> dict[str, str]:
+        results: dict[str, str] = {}
+        if len(zht_texts) > 1:
+            results = _retry_api_call(_call_deepseek_pairs_batch, zht_texts)
+        # Sentences the batch answer did not cover are asked one by one
+        for zht_text in zht_texts:
+            if zht_text not in results:
+                results[zht_text] = _retry_api_call(pairs_func, zht_text)
+        return results
+
+    to_fetch: list[str] = []
+    for _, _, _, text_content, _, _ in pending_rows:
+        if text_content in cache_keys:
+            continue
+        key = cache_keys[text_content] = _pairs_cache_key(provider, text_content)
+        if key in disk_cache:
+            pairs_cache[text_content] = disk_cache[key][1]
+        elif text_content in resumed_pairs:
+            pairs_cache[text_content] = resumed_pairs[text_content]
+        else:
+            to_fetch.append(text_content)
+
+    # Fetch the remaining pairs concurrently, LLM_CONCURRENCY requests in flight
+    max_workers = max(1, int(os.getenv("LLM_CONCURRENCY", "16")))
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pairs_futures: dict[str, Future] = {}
+    for start in range(0, len(to_fetch), batch_size):
+        batch = to_fetch[start:start + batch_size]
+        future = executor.submit(fetch_pairs, batch)
+        for text_content in batch:
+            pairs_futures[text_content] = future
+
+    try:
+        # The LLM requests are in flight now: load and match the PT cues meanwhile
+        pt_entries = _load_pt_entries(pt_secs_path, pt_tree)
+
+        # pt_entries is sorted by begin: bisect on begins, and on the running maximum of
+        # ends to find the first entry overlapping a window without scanning the list
+        pt_begins = [begin_pt for begin_pt, _, _ in pt_entries]
+        pt_max_ends = list(accumulate((end_pt for _, end_pt, _ in pt_entries), max))
+
+        def match_pt_text(zht_begin: int, zht_end: int) -> str:
+            # Prefer PT whose begin falls within the ZHT interval
+            i = bisect_left(pt_begins, zht_begin)
+            if i < len(pt_begins) and pt_begins[i] <= zht_end:
+                return pt_entries[i][2]
+            # Otherwise take the first overlapping interval (begin <= zht_end and end >= zht_begin)
+            j = bisect_left(pt_max_ends, zht_begin)
+            if j < bisect_right(pt_begins, zht_end):
+                return pt_entries[j][2]
+            return "N/A"
+
+        # Second pass: write lines in subtitle order as their pairs arrive, so resume keeps working
+        with base_out_path.open(file_mode, encoding="utf-8", buffering=1 << 20) as output_file:
+            for idx, begin_time, end_time, text_content, z_begin, z_end in pending_rows:
+                pt_text = match_pt_text(z_begin, z_end)
+                if text_content in pairs_cache:
+                    pairs_str = pairs_cache[text_content]
+                else:
+                    future = pairs_futures[text_content]
+                    if not future.done():
+                        # Put every line assembled so far on disk before blocking on the LLM
+                        output_file.flush()
+                    try:
+                        pairs_str = future.result()[text_content]
+                    except Exception as e:
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        abort_on_llm_error(e, text_content)
+                    pairs_cache[text_content] = pairs_str
+                    disk_cache[cache_keys[text_content]] = [time.time(), pairs_str]
+                    unsaved_entries += 1
+                    if unsaved_entries >= 50:
+                        _save_pairs_cache(disk_cache)
+                        unsaved_entries = 0
+
+                # Use tab-separated fields for safety; insert end time after begin time.
+                # zht/pt texts come from _extract_text_content, already whitespace-collapsed.
+                line = (
+                    f"{index_counter}\t{_sanitize_tsv_field(begin_time)}\t{_sanitize_tsv_field(end_time)}\t"
+                    f"{text_content}\t{_sanitize_tsv_field(pairs_str)}\t{pt_text}"
+                )
+
+                output_file.write(line)
+                output_file.write("\n")
+
+                index_counter += 1
+                _print_progress(idx, total_nodes, prefix="Gerando base/LLM")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if unsaved_entries:
+            _save_pairs_cache(disk_cache)
 
     return base_out_path
 
@@ -1252,12 +1627,22 @@ def validate_directory(directory: Path) -> tuple[bool, str]:
     if not srt_files:
         return False, "Nenhum arquivo SRT encontrado no diretório"
     
+    # Plain substring tests on one lowercased name per file; skip already processed ones
+    names_lower = [
+        name for name in (f.name.lower() for f in srt_files)
+        if "_secs" not in name and "_real" not in name
+    ]
+
     # Check for zht files, but exclude already processed ones
-    zht_files = [f for f in srt_files if re.search(r"[-_]zht", f.name, re.IGNORECASE) and not re.search(r"_(traditional|portuguese|secs|real)", f.name, re.IGNORECASE)]
+    zht_files = [
+        name for name in names_lower
+        if ("-zht" in name or "_zht" in name)
+        and "_traditional" not in name and "_portuguese" not in name
+    ]
     
     # If no zht files found, check for pt-BR files to start translation flow
     if not zht_files:
-        pt_files = [f for f in srt_files if (re.search(r"_pt", f.name, re.IGNORECASE) or f.name.lower().endswith(".pt-br.srt")) and not re.search(r"_(secs|real)", f.name, re.IGNORECASE)]
+        pt_files = [name for name in names_lower if "_pt" in name or name.endswith(".pt-br.srt")]
         if not pt_files:
             return False, "Nenhum arquivo SRT com 'zht' ou 'pt-BR' encontrado no diretório"
         else:
@@ -1281,17 +1666,25 @@ def find_language_files(directory: Path) -> tuple[Path | None, Path, str]:
     if not all_srt:
         raise ValueError("Nenhum arquivo .srt encontrado no diretório informado")
 
-    def is_candidate(path: Path) -> bool:
-        name_lower = path.name.lower()
-        return ("_secs" not in name_lower) and ("_real" not in name_lower)
-
-    candidates = [p for p in all_srt if is_candidate(p)]
-
-    # Look for zht files, but exclude already processed ones (containing _traditional, _portuguese, etc.)
-    zht_candidates = [p for p in candidates if re.search(r"[-_]zht", p.name, re.IGNORECASE) and not re.search(r"_(traditional|portuguese|secs|real)", p.name, re.IGNORECASE)]
-    pt_candidates = [p for p in candidates if (re.search(r"_pt", p.name, re.IGNORECASE) or p.name.lower().endswith(".pt-br.srt"))]
-    es_candidates = [p for p in candidates if re.search(r"_es", p.name, re.IGNORECASE)]
-    eng_candidates = [p for p in candidates if re.search(r"_eng", p.name, re.IGNORECASE)]
+    zht_candidates: list[Path] = []
+    pt_candidates: list[Path] = []
+    es_candidates: list[Path] = []
+    eng_candidates: list[Path] = []
+    # Single pass with plain substring tests on one lowercased name per file
+    for p in all_srt:
+        name_lower = p.name.lower()
+        if "_secs" in name_lower or "_real" in name_lower:
+            continue
+        # Look for zht files, but exclude already processed ones (containing _traditional, _portuguese, etc.)
+        if (("-zht" in name_lower or "_zht" in name_lower)
+                and "_traditional" not in name_lower and "_portuguese" not in name_lower):
+            zht_candidates.append(p)
+        if "_pt" in name_lower or name_lower.endswith(".pt-br.srt"):
+            pt_candidates.append(p)
+        if "_es" in name_lower:
+            es_candidates.append(p)
+        if "_eng" in name_lower:
+            eng_candidates.append(p)
 
     zht_file: Path | None
     if not zht_candidates:
@@ -1380,11 +1773,6 @@ def _call_deepseek_translate_to_pt(text: str, timeout_sec: float = 30.0) -> str:
     
     url = f"{api_base}/v1/chat/completions"
     
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-    
     data = {
         "model": model,
         "messages": [
@@ -1401,11 +1789,9 @@ def _call_deepseek_translate_to_pt(text: str, timeout_sec: float = 30.0) -> str:
         "max_tokens": 1000
     }
     
-    req = urlrequest.Request(url, data=json.dumps(data).encode('utf-8'), headers=headers)
-    
-    with urlrequest.urlopen(req, timeout=timeout_sec) as response:
-        result = json.loads(response.read().decode('utf-8'))
-        return result['choices'][0]['message']['content'].strip()
+    # Reuses the per-thread keep-alive connection, like the other chat-completion calls
+    result = json.loads(_post_json(url, data, api_key, timeout_sec))
+    return result['choices'][0]['message']['content'].strip()
 
 def translate_chinese_to_portuguese(text: str) -> str:
     """
@@ -1596,35 +1982,43 @@ def main(argv: list[str]) -> int:
                 
                 # 3. Now process both files normally
                 zht_out = determine_srt_xml_output_path(zht_file)
-                process_srt_file(zht_file, zht_out)
-                merge_same_begin_in_file(zht_out)
-                print(f"Arquivo SRT zht convertido para XML: {zht_out}")
-                
                 other_out = determine_srt_xml_output_path(portuguese_srt_path)
-                process_srt_file(portuguese_srt_path, other_out)
-                merge_same_begin_in_file(other_out)
+                # Both conversions are independent: run them side by side
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    other_future = pool.submit(convert_srt_to_merged_secs, portuguese_srt_path, other_out)
+                    zht_tree = convert_srt_to_merged_secs(zht_file, zht_out)
+                    other_tree = other_future.result()
+                print(f"Arquivo SRT zht convertido para XML: {zht_out}")
                 print(f"Arquivo SRT português convertido para XML: {other_out}")
                 
             else:
                 # Normal processing with both zht and other language files
                 # Always convert the non-zht file first (pt/es/eng)
                 other_out = determine_srt_xml_output_path(other_file)
-                process_srt_file(other_file, other_out)
-                merge_same_begin_in_file(other_out)
-                print(f"Arquivo SRT convertido para XML: {other_out}")
 
                 # If no zht found, create zht from the converted other language file
                 if zht_file is None:
+                    other_tree = convert_srt_to_merged_secs(other_file, other_out)
+                    print(f"Arquivo SRT convertido para XML: {other_out}")
                     print(f"Nenhum SRT 'zht' encontrado. Gerando via LLM a partir de '{other_lang}'.")
                     zht_out = create_zht_secs_from_source(other_out, other_lang, force_provider)
+                    zht_tree = None
                     print(f"Arquivo gerado (zht_secs): {zht_out}")
                 else:
                     zht_out = determine_srt_xml_output_path(zht_file)
-                    process_srt_file(zht_file, zht_out)
-                    merge_same_begin_in_file(zht_out)
+                    # Both conversions are independent: run them side by side
+                    with ThreadPoolExecutor(max_workers=2) as pool:
+                        other_future = pool.submit(convert_srt_to_merged_secs, other_file, other_out)
+                        zht_tree = convert_srt_to_merged_secs(zht_file, zht_out)
+                        other_tree = other_future.result()
+                    print(f"Arquivo SRT convertido para XML: {other_out}")
                     print(f"Arquivo SRT zht convertido para XML: {zht_out}")
 
-            base_txt = generate_zht_base_file(zht_out, other_out, args.resume_from_seconds, force_provider)
+            # Reuse the trees already in memory instead of parsing the secs files again
+            base_txt = generate_zht_base_file(
+                zht_out, other_out, args.resume_from_seconds, force_provider,
+                zht_tree=zht_tree, pt_tree=other_tree,
+            )
             print(f"Arquivo base gerado: {base_txt}")
         except Exception as exc:
             print(f"Erro ao processar '{dir_path.name}': {exc}", file=sys.stderr)
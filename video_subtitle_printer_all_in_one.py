@@ -245,6 +245,9 @@ def create_ffmpeg_drawtext_filters(subtitles: Dict[float, Tuple[str, str, str, s
     
     print(f"   📊 Processando {len(valid_subtitles)} legendas válidas de {len(subtitles)} totais")
     
+    # First subtitle time, used only to gate the debug output below
+    first_begin = min(subtitles)
+    
     # Sort subtitles by time
     for begin_time in sorted(valid_subtitles.keys()):
         chinese_text, translations_text, translations_json, portuguese_text, duration = valid_subtitles[begin_time]
@@ -327,7 +330,7 @@ def create_ffmpeg_drawtext_filters(subtitles: Dict[float, Tuple[str, str, str, s
                 portuguese_y -= overflow
         
         # Debug info for positioning (only for first subtitle to avoid spam)
-        if begin_time == sorted(subtitles.keys())[0]:
+        if begin_time == first_begin:
             print(f"   📐 Posições Y adaptativas: Pinyin={pinyin_y}px, Chinês={chinese_y}px, PT={portuguese_y}px")
             print(f"   📏 Área de legendas: {subtitle_area_height}px ({(subtitle_area_height/video_height)*100:.1f}% da altura)")
             print(f"   🔵 Margem inferior: {bottom_margin}px, Espaçamento: {vertical_spacing}px")
@@ -460,11 +463,11 @@ def create_ffmpeg_drawtext_filters(subtitles: Dict[float, Tuple[str, str, str, s
             
             current_x += word_width
     
-    # Format for filter complex script file - with validation
-    # Remove any empty or invalid filter parts
-    valid_filter_parts = [f for f in filter_parts if f and f.strip() and 'drawtext=' in f]
+    # Format for filter complex script file
+    # Every part comes from a non-empty drawtext f-string above, so no validity pass is needed
+    valid_filter_parts = filter_parts
     
-    print(f"   🔧 Gerados {len(valid_filter_parts)} filtros válidos de {len(filter_parts)} totais")
+    print(f"   🔧 Gerados {len(valid_filter_parts)} filtros")
     
     if valid_filter_parts:
         # Use pipeline approach for better reliability with many filters